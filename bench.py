@@ -0,0 +1,326 @@
+# 합성 단어장으로 DB/학습/채점 경로를 재는 벤치마크.
+#   uv run bench.py                      # 1k/10k/100k, 결과 JSON을 표준 출력으로
+#   uv run bench.py --sizes 1000 --output bench.json
+#   xvfb-run -a uv run bench.py --gui    # 가상 디스플레이에서 GUI 경로까지
+# 싱글톤(SqliteManager, WordManager ...)이 프로세스마다 하나라서 크기마다 임시 폴더에서
+# 하위 프로세스를 따로 띄운다. Gemini는 부르지 않고 스텁 클라이언트로 채점한다.
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Tuple
+
+from gemini_stub import StubGeminiClient
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [1000, 10000, 100000]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호"
+
+
+def summarize(samples: list) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n": len(ms),
+        "total_ms": round(sum(ms), 3),
+        "median_ms": round(statistics.median(ms), 4),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def timed(fn: Callable[[], Any], repeat: int = 1) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+# 같은 시드면 같은 단어장이 나온다. 단어는 겹치지 않게 번호를 붙인다.
+def write_deck(path: str, size: int, seed: int = 1):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("word\tmeaning\texample\n")
+        for i in range(size):
+            word = "".join(rng.choices(LETTERS, k=rng.randint(3, 9))) + LETTERS[i % 26]
+            word += str(i)
+            meaning = ", ".join(
+                "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+                for _ in range(rng.randint(1, 3))
+            )
+            f.write(f"{word}\t{meaning}\tWe use {word} in this sentence.\n")
+
+
+def bench_data(core: Any, size: int, deck: str, results: dict):
+    db = core.SqliteManager()
+    results["init_schema"] = summarize(timed(lambda: core.init_schema(db)))
+
+    imported = []
+    results["bulk_import"] = summarize(
+        timed(lambda: imported.append(core.import_words(deck)))
+    )
+    results["bulk_import"]["rows"] = imported[0][1]
+    # 10%는 어려운 단어로 둔다
+    db.query(f"UPDATE {core.TABLE_NAME} SET hardness = 1 WHERE id % 10 = 0")
+
+    counter = iter(range(10**9))
+    results["insert"] = summarize(
+        timed(
+            lambda: db.insert(
+                core.TABLE_NAME,
+                {"word": f"single{next(counter)}", "meaning": "뜻", "example": ""},
+            ),
+            repeat=200,
+        )
+    )
+    results["update_async"] = summarize(
+        timed(
+            lambda: db.update(
+                core.TABLE_NAME,
+                {"example": "updated"},
+                random.randint(1, size),
+                wait=False,
+            ),
+            repeat=1000,
+        )
+    )
+    results["flush"] = summarize(timed(db.flush))
+
+    wm = core.WordManager()
+    results["get_all_words_cold"] = summarize(
+        timed(lambda: [wm.invalidate(), wm.get_all_words()], repeat=3)
+    )
+    results["get_all_words_warm"] = summarize(timed(wm.get_all_words, repeat=100))
+    results["get_hard_words"] = summarize(timed(wm.get_hard_words, repeat=100))
+    results["search_empty"] = summarize(timed(lambda: wm.search(""), repeat=20))
+    results["search_prefix"] = summarize(timed(lambda: wm.search("ab"), repeat=20))
+
+    scheduler = core.StudyScheduler(wm)
+    results["study_start"] = summarize(timed(lambda: scheduler.start(False), repeat=5))
+    answers = []
+    while (card := scheduler.next_card()) is not None:
+        # 네 번에 한 번은 틀린 답을 낸다
+        wrong = len(answers) % 4 == 3
+        user_in = "모르겠다" if wrong else card["meaning"].split(",")[0]
+
+        def answer(card=card, user_in=user_in):
+            correct = card.answers("meaning").matches(user_in)
+            scheduler.answer(card, correct)
+
+        answers.extend(timed(answer))
+    results["study_answer"] = summarize(answers)
+
+    for word_id in random.sample(range(1, size + 1), min(20, size)):
+        wm.note_miss(word_id)
+    for weighted in (False, True):
+        key = "alert_pick_weighted" if weighted else "alert_pick_uniform"
+
+        def pick(weighted=weighted):
+            word = wm.random_word(weighted=weighted)
+            word.answers("meaning").matches(word["meaning"])
+
+        results[key] = summarize(timed(pick, repeat=1000))
+    # 난이도를 바꾼 직후의 뽑기. 가중치 묶음은 바꿀 때 그 자리에서 고쳐진다.
+    first = wm.get_word(1)
+    results["alert_pick_rebuild"] = summarize(
+        timed(
+            lambda: [
+                wm.set_hardness(first, 1 - first["hardness"]),
+                wm.random_word(weighted=True),
+            ],
+            repeat=5,
+        )
+    )
+    db.flush()
+
+
+def bench_grading(core: Any, latency: float, results: dict):
+    engine = core.GradingEngine()
+    client = StubGeminiClient(latency)
+    engine.set_client(client)
+    # 스텁 상대로는 요청 한도를 풀어 엔진 자체의 오버헤드만 잰다
+    engine.limiter = core.TokenBucket(1e9, 1e9)
+
+    # 제출부터 결과가 채워질 때까지(완료 콜백 시각)를 잰다
+    def run(pairs: list) -> Tuple[list, float]:
+        waits: list = []
+        started = time.perf_counter()
+        futures = []
+        for word, writing in pairs:
+            while (future := engine.submit(word, writing)) is None:
+                time.sleep(0.001)
+            submitted = time.perf_counter()
+            future.add_done_callback(
+                lambda _, s=submitted: waits.append(time.perf_counter() - s)
+            )
+            futures.append(future)
+        for future in futures:
+            future.result()
+        return waits, time.perf_counter() - started
+
+    pairs = [
+        (f"word{i}", f"I wrote word{i} in sentence number {i}.") for i in range(200)
+    ]
+    waits, elapsed = run(pairs)
+    results["grade_api"] = summarize(waits)
+    results["grade_api"]["per_second"] = round(len(pairs) / elapsed, 1)
+    results["grade_api"]["stub_calls"] = client.models.calls
+    waits, _ = run(pairs)
+    results["grade_cache_hit"] = summarize(waits)
+    rejected = [(f"word{i}", "no target here at all") for i in range(200)]
+    waits, _ = run(rejected)
+    results["grade_precheck_reject"] = summarize(waits)
+
+
+def bench_gui(main: Any, size: int, results: dict):
+    class BenchApp(main.App):
+        # API 키 입력 창과 Gemini 예열을 띄우지 않는다
+        def init_ai_system(self):
+            pass
+
+    started = time.perf_counter()
+    app = BenchApp()
+    app.update()
+    results["gui_startup"] = summarize([time.perf_counter() - started])
+
+    def refresh():
+        app.refresh_word_list()
+        app.update_idletasks()
+
+    results["gui_refresh_word_list"] = summarize(timed(refresh, repeat=10))
+
+    def search(text: str):
+        app.search_entry.delete(0, "end")
+        app.search_entry.insert(0, text)
+        app.run_search()
+        app.update_idletasks()
+
+    results["gui_search"] = summarize(
+        timed(lambda: search("ab"), repeat=5) + timed(lambda: search(""), repeat=5)
+    )
+
+    def scroll():
+        # 스크롤바를 끌어 놓는 것과 같은 경로
+        app.word_list_frame.yview("moveto", str(random.random()))
+        app.update_idletasks()
+
+    results["gui_scroll"] = summarize(timed(scroll, repeat=50))
+
+    results["gui_start_study"] = summarize(
+        timed(lambda: [app.start_study(False), app.update_idletasks()])
+    )
+    answers = []
+    for _ in range(min(50, size)):
+        if app.current_word is None:
+            break
+        app.interact.delete(0, "end")
+        app.interact.insert(0, app.current_word["meaning"])
+        answers.extend(
+            timed(lambda: [app.check_answer_logic(), app.update_idletasks()])
+        )
+    results["gui_check_answer"] = summarize(answers)
+    app.destroy()
+
+
+def run_worker(args: argparse.Namespace) -> dict:
+    started = time.perf_counter()
+    import core
+
+    results: dict = {"import_core": summarize([time.perf_counter() - started])}
+    deck = os.path.join(os.getcwd(), "deck.tsv")
+    write_deck(deck, args.worker, args.seed)
+    random.seed(args.seed)
+    bench_data(core, args.worker, deck, results)
+    bench_grading(core, args.stub_latency, results)
+    if args.gui:
+        import main
+
+        bench_gui(main, args.worker, results)
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Goeha Words 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--stub-latency", type=float, default=0.0, help="스텁 Gemini 응답 지연(초)"
+    )
+    parser.add_argument(
+        "--gui", action="store_true", help="GUI 경로도 잰다 (DISPLAY 필요, 예: xvfb-run)"
+    )
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        # 표준 출력은 결과 JSON 전용이다. 측정 중 나오는 로그는 stderr로 보낸다.
+        with contextlib.redirect_stdout(sys.stderr):
+            results = run_worker(args)
+        json.dump(results, sys.stdout)
+        return
+
+    if args.gui and not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        parser.error("--gui에는 디스플레이가 필요합니다. xvfb-run -a로 실행하세요.")
+
+    report: dict = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "stub_latency": args.stub_latency,
+            "gui": args.gui,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    for size in args.sizes:
+        print(f"단어 {size:,}개 측정 중...", file=sys.stderr)
+        with tempfile.TemporaryDirectory(prefix="goeha-bench-") as work_dir:
+            command = [sys.executable, os.path.abspath(__file__), "--worker", str(size)]
+            command += ["--seed", str(args.seed), "--stub-latency", str(args.stub_latency)]
+            if args.gui:
+                command.append("--gui")
+            done = subprocess.run(
+                command, cwd=work_dir, capture_output=True, text=True
+            )
+            if done.returncode != 0:
+                sys.stderr.write(done.stderr)
+                sys.exit(f"단어 {size:,}개 측정 실패")
+            report["results"][str(size)] = json.loads(done.stdout)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1894 @@
+# GUI 없이 쓰는 핵심 로직: DB, 단어 캐시, 학습 스케줄러, 기록, Gemini 채점.
+# main.py(데스크톱 앱)와 server.py(HTTP 서비스)가 함께 쓴다.
+import time
+import sqlite3
+import random
+import threading
+import json
+import hashlib
+import re
+import unicodedata
+import heapq
+import queue
+import atexit
+import functools
+import os
+import contextlib
+import csv
+import itertools
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, Tuple, TypedDict, List, Any
+
+# Gemini API: import만 1초 가까이 걸려서 AI 기능을 처음 쓸 때 load_genai()로 불러온다
+genai: Any = None
+types: Any = None
+
+# 변수
+DB_NAME = "goeha_words.db"
+TABLE_NAME = "words_table"
+KEY_TABLE_NAME = "key_table"
+FTS_TABLE_NAME = "words_fts"
+GRADE_CACHE_TABLE_NAME = "grade_cache"
+ENRICH_TABLE_NAME = "enrich_checkpoint"
+PERF_TABLE_NAME = "perf_spans"
+ANSWER_LOG_TABLE_NAME = "answer_log"
+WORD_STATS_TABLE_NAME = "word_stats"
+MODEL_ID = "gemini-3-flash-preview"
+GRADING_INSTRUCTION = "You are a precise writing evaluator. Use Korean for feedback."
+
+# 스키마 마이그레이션: PRAGMA user_version = 목록 인덱스 + 1
+MIGRATIONS: List[List[str]] = [
+    [
+        f"CREATE INDEX IF NOT EXISTS idx_words_hardness ON {TABLE_NAME}(hardness)",
+        f"CREATE INDEX IF NOT EXISTS idx_words_word ON {TABLE_NAME}(word)",
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5(
+            word, meaning, example,
+            content='{TABLE_NAME}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS words_fts_ai AFTER INSERT ON {TABLE_NAME} BEGIN
+            INSERT INTO {FTS_TABLE_NAME}(rowid, word, meaning, example)
+            VALUES (new.id, new.word, new.meaning, new.example);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS words_fts_ad AFTER DELETE ON {TABLE_NAME} BEGIN
+            INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, word, meaning, example)
+            VALUES ('delete', old.id, old.word, old.meaning, old.example);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS words_fts_au
+            AFTER UPDATE OF word, meaning, example ON {TABLE_NAME} BEGIN
+            INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, word, meaning, example)
+            VALUES ('delete', old.id, old.word, old.meaning, old.example);
+            INSERT INTO {FTS_TABLE_NAME}(rowid, word, meaning, example)
+            VALUES (new.id, new.word, new.meaning, new.example);
+        END""",
+        f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')",
+    ],
+    [
+        f"ALTER TABLE {TABLE_NAME} ADD COLUMN ease REAL DEFAULT 2.5",
+        f"ALTER TABLE {TABLE_NAME} ADD COLUMN interval_days REAL DEFAULT 0",
+        f"ALTER TABLE {TABLE_NAME} ADD COLUMN reps INTEGER DEFAULT 0",
+        f"ALTER TABLE {TABLE_NAME} ADD COLUMN due REAL DEFAULT 0",
+        f"CREATE INDEX IF NOT EXISTS idx_words_due ON {TABLE_NAME}(due)",
+        f"CREATE INDEX IF NOT EXISTS idx_words_hard_due ON {TABLE_NAME}(hardness, due)",
+    ],
+    [
+        f"""CREATE TABLE IF NOT EXISTS {GRADE_CACHE_TABLE_NAME} (
+            key TEXT PRIMARY KEY, result TEXT, created REAL, last_used REAL
+        )""",
+        f"CREATE INDEX IF NOT EXISTS idx_grade_cache_last_used ON {GRADE_CACHE_TABLE_NAME}(last_used)",
+    ],
+    [
+        f"""CREATE TABLE IF NOT EXISTS {ENRICH_TABLE_NAME} (
+            word_id INTEGER PRIMARY KEY, status TEXT, updated REAL
+        )""",
+    ],
+    [
+        f"""CREATE TABLE IF NOT EXISTS {PERF_TABLE_NAME} (
+            name TEXT, started REAL, duration_ms REAL
+        )""",
+        f"CREATE INDEX IF NOT EXISTS idx_perf_spans_name ON {PERF_TABLE_NAME}(name, started)",
+    ],
+    [
+        # kind: study(학습), quiz(깜짝 퀴즈), writing(작문 채점)
+        f"""CREATE TABLE IF NOT EXISTS {ANSWER_LOG_TABLE_NAME} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER, kind TEXT, correct INTEGER, score INTEGER, created REAL
+        )""",
+        f"CREATE INDEX IF NOT EXISTS idx_answer_log_word ON {ANSWER_LOG_TABLE_NAME}(word_id, created)",
+        f"""CREATE TABLE IF NOT EXISTS {WORD_STATS_TABLE_NAME} (
+            word_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL DEFAULT 0, correct INTEGER NOT NULL DEFAULT 0,
+            grade_count INTEGER NOT NULL DEFAULT 0, score_sum INTEGER NOT NULL DEFAULT 0,
+            last_seen REAL
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS words_stats_ad AFTER DELETE ON {TABLE_NAME} BEGIN
+            DELETE FROM {WORD_STATS_TABLE_NAME} WHERE word_id = old.id;
+            DELETE FROM {ANSWER_LOG_TABLE_NAME} WHERE word_id = old.id;
+        END""",
+    ],
+]
+
+
+def load_genai() -> Tuple[Any, Any]:
+    global genai, types
+    if genai is None:
+        from google import genai as genai_module
+        from google.genai import types as types_module
+
+        genai, types = genai_module, types_module
+    return genai, types
+
+
+# 느린 구간(쿼리, 목록 갱신, 모달 생성, Gemini 호출)의 소요 시간 기록.
+# 꺼져 있으면 플래그 하나만 보고 바로 원래 함수를 부른다.
+# 켜는 방법: --perf 또는 GOEHA_PERF=1, DB에도 남기려면 --perf-db 또는 GOEHA_PERF=db
+class PerfRecorder:
+    RING_SIZE = 4096
+    PERSIST_EVERY = 200
+
+    def __init__(self, mode: str = "") -> None:
+        self.enabled = mode in ("1", "db")
+        self.persist = mode == "db"
+        self.spans: deque = deque(maxlen=self.RING_SIZE)  # (이름, 시작 시각, 소요 ms)
+        self.unsaved: List[Tuple[str, float, float]] = []
+        self.lock = threading.Lock()
+
+    def record(self, name: str, started: float):
+        took = (time.perf_counter() - started) * 1000
+        # started는 perf_counter 값이라 벽시계 시작 시각은 끝 시각에서 거꾸로 구한다
+        span = (name, time.time() - took / 1000, took)
+        self.spans.append(span)
+        if self.persist:
+            with self.lock:
+                self.unsaved.append(span)
+                full = len(self.unsaved) >= self.PERSIST_EVERY
+            if full:
+                self.save(wait=False)
+
+    @contextlib.contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    def span(self, name: str) -> Any:
+        return self._span(name) if self.enabled else contextlib.nullcontext()
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        def decorate(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, started)
+
+            return wrapper
+
+        return decorate
+
+    # 이름별 (횟수, p50, p95) ms. 링 버퍼에 남아 있는 구간만 센다.
+    def stats(self) -> dict[str, Tuple[int, float, float]]:
+        by_name: dict[str, List[float]] = {}
+        for name, _, took in list(self.spans):
+            by_name.setdefault(name, []).append(took)
+        result = {}
+        for name, took in sorted(by_name.items()):
+            took.sort()
+            p50 = took[len(took) // 2]
+            p95 = took[min(len(took) - 1, int(len(took) * 0.95))]
+            result[name] = (len(took), p50, p95)
+        return result
+
+    def save(self, wait: bool = True):
+        with self.lock:
+            rows, self.unsaved = self.unsaved, []
+        if rows:
+            future = SqliteManager().submit(
+                f"INSERT INTO {PERF_TABLE_NAME} VALUES (?, ?, ?)", rows, many=True
+            )
+            if wait:
+                future.result()
+
+
+PERF = PerfRecorder(os.environ.get("GOEHA_PERF", ""))
+
+
+class WordDict(TypedDict):
+    id: int | None
+    word: str
+    meaning: str
+    example: str | None
+    hardness: int
+
+
+# --- DB 매니저 ---
+# SQL 문자열은 (테이블, 컬럼) 조합마다 한 번만 만든다.
+# sqlite3도 연결마다 prepared statement를 캐시하므로 같은 문자열을 재사용하면 파싱을 건너뛴다.
+@functools.lru_cache(maxsize=128)
+def build_insert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    placeholders = ", ".join(["?"] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+@functools.lru_cache(maxsize=128)
+def build_update_sql(table: str, columns: Tuple[str, ...]) -> str:
+    cols = ", ".join([f"{k}=?" for k in columns])
+    return f"UPDATE {table} SET {cols} WHERE id=?"
+
+
+# SqliteManager/WordManager/StudyStats는 DB 파일 경로마다 인스턴스가 하나다.
+# 데스크톱 앱은 DB_NAME 하나만 쓰고, 서버는 사용자마다 단어장 파일을 따로 연다.
+INSTANCES_LOCK = threading.RLock()
+
+
+# 읽기는 스레드마다 따로 연 WAL 연결로, 쓰기는 전용 writer 스레드 하나가
+# 큐에 쌓인 작업을 모아 한 트랜잭션으로 커밋한다.
+class SqliteManager:
+    _instances: dict[str, "SqliteManager"] = {}
+    BATCH_LIMIT = 500
+
+    def __new__(cls, db_name: str = DB_NAME):
+        key = os.path.abspath(db_name)
+        with INSTANCES_LOCK:
+            if key not in cls._instances:
+                cls._instances[key] = super().__new__(cls)
+        return cls._instances[key]
+
+    def __init__(self, db_name: str = DB_NAME):
+        with INSTANCES_LOCK:
+            if hasattr(self, "initialized"):
+                return
+            self.db_name = db_name
+            self._local = threading.local()
+            self._write_queue: queue.Queue = queue.Queue()
+            self._writer = threading.Thread(
+                target=self._write_loop, name="sqlite-writer", daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
+            self.initialized = True
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_name, timeout=30, isolation_level=None, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL에서는 NORMAL이어도 안전하며, 커밋마다 fsync하지 않는다
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # --- writer 스레드 ---
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            job = self._write_queue.get()
+            if job is None:
+                break
+            batch = [job]
+            # 커밋하는 동안 쌓인 쓰기를 한 번에 묶는다
+            while len(batch) < self.BATCH_LIMIT:
+                try:
+                    job = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._write_queue.put(None)
+                    break
+                batch.append(job)
+            self._run_batch(conn, batch)
+        conn.close()
+
+    @PERF.timed("db.write_batch")
+    def _run_batch(self, conn: sqlite3.Connection, batch: list):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, args, many, future in batch:
+                # 작업 하나가 실패해도 같은 배치의 다른 작업은 살린다
+                conn.execute("SAVEPOINT job")
+                try:
+                    if callable(sql):
+                        value = sql(conn, *args)
+                    elif many:
+                        cur = conn.executemany(sql, args)
+                        value = cur.rowcount
+                    else:
+                        cur = conn.execute(sql, args)
+                        value = cur.lastrowid
+                    conn.execute("RELEASE job")
+                    results.append((future, value, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            results = [(job[3], None, e) for job in batch]
+        for future, value, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+    def submit(
+        self, sql: str | Callable[..., Any], args: Any = (), many: bool = False
+    ) -> Future:
+        future: Future = Future()
+        self._write_queue.put((sql, args, many, future))
+        return future
+
+    def execute(self, sql: str, args: Any = ()):
+        return self.submit(sql, args).result()
+
+    # 여러 문장을 writer 연결에서 한 작업으로 돌린다: fn(conn, *args)
+    def call(self, fn: Callable[..., Any], *args: Any):
+        return self.submit(fn, args).result()  # type: ignore[arg-type]
+
+    def executemany(self, sql: str, seq: Any):
+        return self.submit(sql, list(seq), many=True).result()
+
+    def flush(self):
+        if self._writer.is_alive():
+            self.submit("SELECT 1").result()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
+
+    # --- 공개 API ---
+    def insert(self, table, data: dict):
+        sql = build_insert_sql(table, tuple(data.keys()))
+        try:
+            return self.execute(sql, tuple(data.values()))
+        except Exception as e:
+            return None
+
+    def update(self, table, data: dict, row_id: int, wait: bool = True):
+        sql = build_update_sql(table, tuple(data.keys()))
+        future = self.submit(sql, tuple(data.values()) + (row_id,))
+        return future.result() if wait else future
+
+    @PERF.timed("db.query")
+    def get_all(self, table, where: dict | None = None):
+        sql = f"SELECT * FROM {table}"
+        values = ()
+        if where:
+            conditions = [f"{k}=?" for k in where.keys()]
+            sql += " WHERE " + " AND ".join(conditions)
+            values = tuple(where.values())
+        return [dict(row) for row in self.conn.execute(sql, values).fetchall()]
+
+    def migrate(self, migrations: List[List[str]]):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for i in range(version, len(migrations)):
+            self.call(self._migrate_step, migrations[i], i + 1)
+
+    # 한 단계의 문장과 버전 기록을 writer 작업 하나로 돌린다.
+    # 하나라도 실패하면 단계 전체가 되돌려지고 예외가 호출 측으로 올라간다.
+    @staticmethod
+    def _migrate_step(conn: sqlite3.Connection, statements: List[str], version: int):
+        for sql in statements:
+            conn.execute(sql)
+        conn.execute(f"PRAGMA user_version = {version}")
+
+    @PERF.timed("db.query")
+    def query(self, sql, args=()):
+        if sql.strip().upper().startswith("SELECT"):
+            return [dict(row) for row in self.conn.execute(sql, args).fetchall()]
+        else:
+            return self.execute(sql, args)
+
+
+def init_schema(db: SqliteManager):
+    db.query(
+        f"CREATE TABLE IF NOT EXISTS {TABLE_NAME} (id INTEGER PRIMARY KEY AUTOINCREMENT, word TEXT, meaning TEXT, example TEXT, hardness INTEGER DEFAULT 0)"
+    )
+    db.query(
+        f"CREATE TABLE IF NOT EXISTS {KEY_TABLE_NAME} (id INTEGER PRIMARY KEY AUTOINCREMENT, api_key TEXT)"
+    )
+    db.migrate(MIGRATIONS)
+
+
+# --- 정답 매칭 ---
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172
+
+
+# 한글 음절을 초성/중성/종성 자모로 풀어서 "책임지다"/"책임지디"처럼 한 글자 틀린 답이
+# 음절 통째가 아니라 자모 하나 차이로 계산되게 한다.
+def decompose_hangul(text: str) -> str:
+    out = []
+    for ch in text:
+        code = ord(ch) - HANGUL_BASE
+        if 0 <= code < HANGUL_COUNT:
+            out.append(chr(0x1100 + code // 588))
+            out.append(chr(0x1161 + (code % 588) // 28))
+            if code % 28:
+                out.append(chr(0x11A7 + code % 28))
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def normalize_answer(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    # 띄어쓰기와 문장부호 차이는 무시한다
+    return decompose_hangul(re.sub(r"[\W_]+", "", text))
+
+
+# 편집거리가 limit를 넘는 순간 바로 포기하는 Levenshtein (행 최솟값 > limit면 조기 종료)
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if cur[j] < row_min:
+                row_min = cur[j]
+        if row_min > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+# 단어를 저장할 때 한 번만 만들어 두는 정답 목록: (정규화된 답, 허용 편집거리)
+class AnswerIndex:
+    __slots__ = ("keys",)
+
+    def __init__(self, answer_text: str):
+        keys = []
+        for part in re.split(r"[,;/]", answer_text or ""):
+            variants = [part]
+            # "~을 책임지다" 같은 뜻은 "책임지다"만 써도 정답으로 본다
+            if part.strip().startswith("~"):
+                variants.append(re.sub(r"^\s*~\S*\s*", "", part))
+            for variant in variants:
+                key = normalize_answer(variant)
+                if key and all(key != k for k, _ in keys):
+                    keys.append((key, self.tolerance(key)))
+        self.keys = tuple(keys)
+
+    @staticmethod
+    def tolerance(key: str) -> int:
+        # 짧은 답은 한 글자 차이로 다른 단어가 되기 쉬워서 정확히 맞아야 한다.
+        # 한글은 자모로 풀려 있으니 길이를 음절(초성 또는 자모가 아닌 글자) 수로 센다.
+        # "사과"/"사고", "학교"/"학기"처럼 두 음절 답은 자모 하나 차이도 틀린 답이다.
+        if key.isascii():
+            length, short, long = len(key), 6, 12
+        else:
+            length = sum(1 for ch in key if not 0x1161 <= ord(ch) <= 0x11FF)
+            short, long = 3, 6
+        if length < short:
+            return 0
+        return 1 if length < long else 2
+
+    def matches(self, user_input: str) -> bool:
+        guess = normalize_answer(user_input)
+        if not guess:
+            return False
+        for key, tol in self.keys:
+            if guess == key:
+                return True
+            if tol and bounded_edit_distance(guess, key, tol) <= tol:
+                return True
+        return False
+
+
+# 캐시에 들어가는 단어 한 줄. dict 대신 __slots__로 메모리를 줄이고,
+# w["word"], w.get("example") 같은 기존 dict 방식 접근도 그대로 지원한다.
+class WordRecord:
+    COLUMNS = (
+        "id",
+        "word",
+        "meaning",
+        "example",
+        "hardness",
+        "ease",
+        "interval_days",
+        "reps",
+        "due",
+    )
+    __slots__ = COLUMNS + ("answer_cache",)
+
+    def __init__(self, row: Any):
+        for k in self.COLUMNS:
+            setattr(self, k, row[k] if k in row.keys() else None)
+        self.answer_cache: dict[str, AnswerIndex] = {}
+        self.hardness = self.hardness or 0
+        self.ease = self.ease or 2.5
+        self.interval_days = self.interval_days or 0
+        self.reps = self.reps or 0
+        self.due = self.due or 0
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key: str, default: Any = None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self.COLUMNS
+
+    def to_dict(self) -> WordDict:
+        return {k: getattr(self, k) for k in self.COLUMNS}  # type: ignore
+
+    # field: "meaning"(뜻을 맞히는 문제) 또는 "word"(영단어를 맞히는 문제)
+    def answers(self, field: str = "meaning") -> AnswerIndex:
+        index = self.answer_cache.get(field)
+        if index is None:
+            index = self.answer_cache[field] = AnswerIndex(getattr(self, field))
+        return index
+
+    def __repr__(self):
+        return f"WordRecord({self.to_dict()!r})"
+
+
+# 퀴즈 추출용 id 묶음. 위치 인덱스를 같이 들고 있어 추가/삭제/무작위 뽑기가 모두 O(1)이다.
+class IdBucket:
+    __slots__ = ("ids", "pos")
+
+    def __init__(self, ids: Any = ()):
+        self.ids: List[int] = list(ids)
+        self.pos: dict[int, int] = {wid: i for i, wid in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, wid: int) -> bool:
+        return wid in self.pos
+
+    def add(self, wid: int):
+        if wid not in self.pos:
+            self.pos[wid] = len(self.ids)
+            self.ids.append(wid)
+
+    # 마지막 원소를 빈자리로 옮겨 O(1)에 뺀다
+    def remove(self, wid: int):
+        pos = self.pos.pop(wid, None)
+        if pos is None:
+            return
+        last = self.ids.pop()
+        if last != wid:
+            self.ids[pos] = last
+            self.pos[last] = pos
+
+    def choice(self) -> int:
+        return self.ids[random.randrange(len(self.ids))]
+
+
+class WordManager:
+    _instances: dict[str, "WordManager"] = {}
+    # 깜짝 퀴즈 가중치: 모든 단어 1에 해당하는 묶음마다 더한다
+    HARD_WEIGHT = 3.0
+    MISSED_WEIGHT = 3.0
+    WEAK_WEIGHT = 3.0  # 정답률이 낮은 단어 (StudyStats.is_weak)
+    MISSED_WINDOW = 86400  # 하루 안에 틀린 단어에 가중치
+
+    def __new__(cls, db_name: str = DB_NAME):
+        key = os.path.abspath(db_name)
+        with INSTANCES_LOCK:
+            if key not in cls._instances:
+                cls._instances[key] = super().__new__(cls)
+        return cls._instances[key]
+
+    def __init__(self, db_name: str = DB_NAME) -> None:
+        if hasattr(self, "sq_manager"):
+            return
+        self.sq_manager = SqliteManager(db_name)
+        self.listeners: List[Callable[[str, WordRecord], None]] = []
+        # 인메모리 캐시: id 인덱스, hardness=1 부분집합, 전체 목록 스냅샷
+        self._by_id: dict[int, WordRecord] | None = None
+        self._hard: dict[int, WordRecord] = {}
+        self._snapshot: List[WordRecord] | None = None
+        self._snapshot_positions: Tuple[Any, dict[int, int]] = (None, {})
+        # 퀴즈 추출용 id 묶음. 이벤트마다 고쳐 두고 다시 만들지 않는다.
+        self._all = IdBucket()
+        self._hard_ids = IdBucket()
+        self._missed_ids = IdBucket()
+        self._weak_ids = IdBucket()
+        self._missed: dict[int, float] = {}  # 최근에 틀린 단어 id -> 시각
+        self._answers: dict[int, List[int]] = {}  # id -> [푼 횟수, 맞힌 횟수]
+        self.hits = 0
+        self.misses = 0
+
+    # --- 캐시 ---
+    def _load(self) -> dict[int, WordRecord]:
+        if self._by_id is None:
+            with PERF.span("words.load"):
+                rows = self.sq_manager.get_all(TABLE_NAME)
+                self._by_id = {r["id"]: WordRecord(r) for r in rows}
+                self._hard = {i: w for i, w in self._by_id.items() if w.hardness == 1}
+                self._snapshot = None
+                self._all = IdBucket(self._by_id)
+                self._hard_ids = IdBucket(self._hard)
+                self._missed_ids = IdBucket(i for i in self._missed if i in self._by_id)
+                stats = StudyStats(self.sq_manager.db_name)
+                self._answers = stats.answer_counts()
+                self._weak_ids = IdBucket(
+                    i
+                    for i, (attempts, correct) in self._answers.items()
+                    if i in self._by_id and stats.is_weak(attempts, correct)
+                )
+        return self._by_id
+
+    def _read(self) -> dict[int, WordRecord]:
+        if self._by_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return self._load()
+
+    def invalidate(self):
+        self._by_id = None
+        self._hard = {}
+        self._snapshot = None
+        self._all = IdBucket()
+        self._hard_ids = IdBucket()
+        self._missed_ids = IdBucket()
+        self._weak_ids = IdBucket()
+
+    # 대량 가져오기처럼 캐시를 거치지 않은 쓰기 뒤에 부른다 (메인 스레드)
+    def reload(self):
+        self.sq_manager.flush()
+        self.invalidate()
+        self._load()
+        self._emit("reloaded", None)
+
+    # --- 퀴즈 추출 ---
+    def note_miss(self, word_id: int):
+        self._missed[word_id] = time.time()
+        if self._by_id is not None and word_id in self._by_id:
+            self._missed_ids.add(word_id)
+
+    # 풀이 기록을 남기고 정답률이 낮은 단어 묶음을 그 자리에서 고친다
+    def record_answer(self, word_id: int, kind: str, correct: bool) -> Future:
+        stats = StudyStats(self.sq_manager.db_name)
+        counts = self._answers.setdefault(word_id, [0, 0])
+        counts[0] += 1
+        counts[1] += int(correct)
+        if self._by_id is not None and word_id in self._by_id:
+            if stats.is_weak(*counts):
+                self._weak_ids.add(word_id)
+            else:
+                self._weak_ids.remove(word_id)
+        return stats.record_answer(word_id, kind, correct)
+
+    # 묶음 하나를 (가중치 × 크기)에 비례해 고른 뒤 그 안에서 균등하게 뽑는다.
+    # 가중치가 더해지는 구조라 단어별 확률은 1 + 속한 묶음 가중치의 합에 비례한다.
+    def random_word(self, weighted: bool = False) -> WordRecord | None:
+        by_id = self._read()
+        if not self._all:
+            return None
+        if not weighted:
+            return by_id[self._all.choice()]
+        now = time.time()
+        while True:
+            buckets = (
+                (1.0, self._all),
+                (self.HARD_WEIGHT, self._hard_ids),
+                (self.MISSED_WEIGHT, self._missed_ids),
+                (self.WEAK_WEIGHT, self._weak_ids),
+            )
+            r = random.random() * sum(w * len(b) for w, b in buckets)
+            for weight, bucket in buckets:
+                r -= weight * len(bucket)
+                if r < 0 and bucket:
+                    break
+            else:
+                bucket = self._all  # 부동소수 오차로 끝까지 남은 경우
+            wid = bucket.choice()
+            # 오답 가중치는 뽑힐 때 만료를 확인한다
+            if bucket is self._missed_ids and now - self._missed[wid] > self.MISSED_WINDOW:
+                self._missed_ids.remove(wid)
+                del self._missed[wid]
+                continue
+            return by_id[wid]
+
+    def cache_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._by_id) if self._by_id is not None else 0,
+        }
+
+    # 반환되는 목록은 캐시와 공유되므로 읽기 전용으로 사용한다.
+    def get_all_words(self) -> List[WordRecord]:
+        by_id = self._read()
+        if self._snapshot is None:
+            self._snapshot = list(by_id.values())
+        return self._snapshot
+
+    # get_all_words() 목록의 id -> 위치. 스냅샷이 바뀔 때만 다시 만들고, 역시 읽기 전용이다.
+    def snapshot_positions(self) -> dict[int, int]:
+        snapshot = self.get_all_words()
+        if self._snapshot_positions[0] is not snapshot:
+            positions = {w.id: i for i, w in enumerate(snapshot)}
+            self._snapshot_positions = (snapshot, positions)
+        return self._snapshot_positions[1]
+
+    def get_hard_words(self) -> List[WordRecord]:
+        self._read()
+        return list(self._hard.values())
+
+    def get_word(self, word_id: int) -> WordRecord | None:
+        return self._read().get(word_id)
+
+    # FTS5 접두어 검색: "app 사" -> "app"* "사"* (모든 단어가 접두어로 일치)
+    @staticmethod
+    def search_terms(text: str) -> List[str]:
+        return re.findall(r"\w+", text.lower())
+
+    @PERF.timed("words.search")
+    def search(self, text: str, limit: int | None = None) -> List[WordRecord]:
+        terms = self.search_terms(text)
+        if not terms:
+            return self.get_all_words()
+        match = " ".join(f'"{t}"*' for t in terms)
+        rows = self.sq_manager.conn.execute(
+            f"SELECT rowid FROM {FTS_TABLE_NAME} WHERE {FTS_TABLE_NAME} MATCH ? LIMIT ?",
+            (match, -1 if limit is None else limit),  # LIMIT -1은 제한 없음
+        )
+        by_id = self._read()
+        return [by_id[r[0]] for r in rows if r[0] in by_id]
+
+    @staticmethod
+    def matches_search(word: WordRecord, terms: List[str]) -> bool:
+        tokens = WordManager.search_terms(
+            f"{word.word or ''} {word.meaning or ''} {word.example or ''}"
+        )
+        return all(any(tok.startswith(t) for tok in tokens) for t in terms)
+
+    # 변경 알림: listener(event, row), event는 "inserted" | "updated" | "deleted"
+    # | "reloaded"(row=None, 전체를 다시 읽음)
+    def subscribe(self, listener: Callable[[str, WordRecord], None]):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, WordRecord], None]):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _emit(self, event: str, row: WordRecord):
+        for listener in list(self.listeners):
+            listener(event, row)
+
+    # --- 쓰기 (write-through) ---
+    def add_word(self, data: dict) -> WordRecord | None:
+        by_id = self._load()
+        wid = self.sq_manager.insert(TABLE_NAME, data)
+        if wid is None:
+            return None
+        record = WordRecord({**data, "id": wid})
+        record.answers("meaning")
+        record.answers("word")
+        by_id[wid] = record
+        if record.hardness == 1:
+            self._hard[wid] = record
+        self._snapshot = None
+        self._all.add(wid)
+        if record.hardness == 1:
+            self._hard_ids.add(wid)
+        self._emit("inserted", record)
+        return record
+
+    def update_word(self, data: dict) -> WordRecord | None:
+        by_id = self._load()
+        data = dict(data)
+        wid = data.pop("id")
+        # 캐시가 기준이므로 커밋을 기다리지 않는다 (writer가 묶어서 커밋)
+        self.sq_manager.update(TABLE_NAME, data, wid, wait=False)
+        record = by_id.get(wid)
+        if record is None:
+            return None
+        for k, v in data.items():
+            if k in WordRecord.COLUMNS:
+                setattr(record, k, v)
+        # 뜻이나 단어가 바뀌면 정답 목록을 다시 만든다
+        for field in ("word", "meaning"):
+            if field in data:
+                record.answer_cache[field] = AnswerIndex(data[field])
+        if record.hardness == 1:
+            self._hard[wid] = record
+            self._hard_ids.add(wid)
+        else:
+            self._hard.pop(wid, None)
+            self._hard_ids.remove(wid)
+        self._emit("updated", record)
+        return record
+
+    def set_hardness(self, word: WordRecord, hardness: int) -> WordRecord | None:
+        return self.update_word({"id": word["id"], "hardness": hardness})
+
+    def delete_word(self, word: WordRecord):
+        by_id = self._load()
+        self.sq_manager.submit(f"DELETE FROM {TABLE_NAME} WHERE id=?", (word["id"],))
+        record = by_id.pop(word["id"], None) or word
+        self._hard.pop(word["id"], None)
+        self._snapshot = None
+        for bucket in (self._all, self._hard_ids, self._missed_ids, self._weak_ids):
+            bucket.remove(word["id"])
+        self._missed.pop(word["id"], None)
+        self._answers.pop(word["id"], None)
+        self._emit("deleted", record)
+
+
+# --- 가져오기/내보내기 ---
+# 파일을 한 줄씩 흘려 읽고 CHUNK 단위 트랜잭션으로 넣는다. 메모리는 파일 크기와 무관하다.
+# 형식은 확장자로 정한다: .csv(쉼표), .tsv(탭), .txt(Anki 텍스트 내보내기, 탭)
+BULK_CHUNK = 5000
+BULK_FILETYPES = [
+    ("CSV", "*.csv"),
+    ("TSV", "*.tsv"),
+    ("Anki 텍스트", "*.txt"),
+]
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+ANKI_META_HEADERS = ("guid", "notetype", "deck", "tags")
+
+
+def bulk_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".tsv": "tsv"}.get(ext, "anki")
+
+
+def iter_word_rows(path: str) -> Iterator[Tuple[str, str, str]]:
+    fmt = bulk_format(path)
+    delimiter = "," if fmt == "csv" else "\t"
+    html = fmt == "anki"
+    meta: set[int] = set()  # 단어/뜻/예문이 아닌 Anki 메타데이터 열 (0부터)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        first = f.readline()
+        # Anki 헤더(#separator:tab, #html:false, #tags column:3 ...)는 건너뛰되 설정은 반영한다
+        while fmt == "anki" and first.startswith("#"):
+            key, _, value = first[1:].strip().partition(":")
+            name, _, kind = key.partition(" ")
+            if key == "separator":
+                delimiter = {"tab": "\t", "comma": ",", "semicolon": ";"}.get(
+                    value, delimiter
+                )
+            elif key == "html":
+                html = value == "true"
+            elif name in ANKI_META_HEADERS and kind == "column" and value.isdigit():
+                meta.add(int(value) - 1)  # Anki 열 번호는 1부터 센다
+            first = f.readline()
+        reader = csv.reader(itertools.chain([first], f), delimiter=delimiter)
+        for i, row in enumerate(reader):
+            if meta:
+                row = [c for j, c in enumerate(row) if j not in meta]
+            if len(row) < 2:
+                continue
+            if html:
+                row = [HTML_TAG_RE.sub("", c) for c in row]
+            word, meaning = row[0].strip(), row[1].strip()
+            example = row[2].strip() if len(row) > 2 else ""
+            if i == 0 and (word.lower(), meaning.lower()) == ("word", "meaning"):
+                continue  # 헤더 줄
+            if word and meaning:
+                yield word, meaning, example
+
+
+# 청크를 임시 테이블에 넣은 뒤 INSERT ... SELECT 한 문장으로 옮긴다.
+# FTS5 트리거는 문장마다 색인을 flush하므로 한 줄씩 INSERT하면 몇 배 느려진다.
+# 이미 있는 단어(word 컬럼 기준, idx_words_word 사용)와 청크 안의 중복은 넣지 않는다.
+def _import_chunk(conn: sqlite3.Connection, chunk: list) -> int:
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS import_stage (word TEXT, meaning TEXT, example TEXT)"
+    )
+    conn.execute("DELETE FROM import_stage")
+    conn.executemany("INSERT INTO import_stage VALUES (?, ?, ?)", chunk)
+    cur = conn.execute(
+        f"""INSERT INTO {TABLE_NAME} (word, meaning, example, hardness)
+        SELECT word, meaning, example, 0 FROM import_stage s
+        WHERE s.rowid IN (SELECT MIN(rowid) FROM import_stage GROUP BY word)
+        AND NOT EXISTS (SELECT 1 FROM {TABLE_NAME} w WHERE w.word = s.word)
+        ORDER BY s.rowid"""
+    )
+    return cur.rowcount
+
+
+# on_progress(읽은 줄 수, 추가된 수)는 워커 스레드에서 불린다.
+def import_words(
+    path: str,
+    on_progress: Callable[[int, int], None] | None = None,
+    db_name: str = DB_NAME,
+) -> Tuple[int, int]:
+    db = SqliteManager(db_name)
+    read = added = 0
+    chunk: list = []
+    for row in iter_word_rows(path):
+        chunk.append(row)
+        read += 1
+        if len(chunk) >= BULK_CHUNK:
+            added += db.call(_import_chunk, chunk)
+            chunk = []
+            if on_progress:
+                on_progress(read, added)
+    if chunk:
+        added += db.call(_import_chunk, chunk)
+    if on_progress:
+        on_progress(read, added)
+    return read, added
+
+
+def export_words(
+    path: str,
+    on_progress: Callable[[int], None] | None = None,
+    db_name: str = DB_NAME,
+) -> int:
+    fmt = bulk_format(path)
+    db = SqliteManager(db_name)
+    db.flush()
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "anki":
+            f.write("#separator:tab\n#html:false\n")
+        else:
+            f.write("word,meaning,example\n" if fmt == "csv" else "word\tmeaning\texample\n")
+        writer = csv.writer(f, delimiter="," if fmt == "csv" else "\t")
+        cur = db.conn.execute(f"SELECT word, meaning, example FROM {TABLE_NAME} ORDER BY id")
+        while rows := cur.fetchmany(BULK_CHUNK):
+            writer.writerows((r[0], r[1], r[2] or "") for r in rows)
+            written += len(rows)
+            if on_progress:
+                on_progress(written)
+    return written
+
+
+# --- 학습 스케줄러 (SM-2) ---
+# 복습 시점이 된 카드만 인덱스(due)로 조금씩 불러오고, 세션 순서는 힙으로 관리한다.
+class StudyScheduler:
+    SESSION_LIMIT = 50
+    RELEARN_GAP = 3  # 틀린 카드는 3장 뒤에 다시 나온다
+    RELEARN_SECONDS = 600  # 틀린 카드는 10분 뒤 다시 복습 대상
+    DAY = 86400
+
+    def __init__(self, word_manager: "WordManager"):
+        self.word_manager = word_manager
+        self.heap: list = []
+        self.pending: set = set()
+        self.missed: set = set()
+        self.shown: int | None = None  # 지금 화면에 나와 있고 아직 답하지 않은 카드
+        self.step = 0
+        self.seq = 0
+        self.total = 0
+        self.solved = 0
+
+    def start(self, hard_only: bool = False, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        db = self.word_manager.sq_manager
+        db.flush()
+        sql = f"SELECT id FROM {TABLE_NAME} WHERE "
+        args: tuple = ()
+        if hard_only:
+            # 별표 단어와 정답률이 낮은 단어
+            sql += f"(hardness=1 OR id IN ({StudyStats.WEAK_IDS_SQL})) AND "
+            args = StudyStats.weak_args()
+        sql += "due <= ? ORDER BY due LIMIT ?"
+        ids = [r[0] for r in db.conn.execute(sql, args + (now, self.SESSION_LIMIT))]
+        random.shuffle(ids)
+        self.heap, self.pending, self.missed = [], set(), set()
+        self.shown = None
+        self.step = self.seq = self.solved = 0
+        for wid in ids:
+            word = self.word_manager.get_word(wid)
+            if word is not None:
+                self._push(word, len(self.heap))
+        self.total = len(self.heap)
+        return self.total
+
+    def _push(self, word: WordRecord, position: int):
+        self.seq += 1
+        heapq.heappush(self.heap, (position, self.seq, word))
+        self.pending.add(word.id)
+
+    def next_card(self) -> WordRecord | None:
+        while self.heap:
+            _, _, word = heapq.heappop(self.heap)
+            self.pending.discard(word.id)
+            # 세션 도중 삭제된 단어는 건너뛴다
+            if self.word_manager.get_word(word.id) is word:
+                self.step += 1
+                self.shown = word.id
+                return word
+        self.shown = None
+        return None
+
+    # 카드가 한 번 나올 때 첫 답만 채점하고 True를 돌려준다. 틀린 뒤 화면의 정답을 보고
+    # 다시 쓰거나 같은 카드를 연달아 틀린 것은 넘어가기만 하므로 풀이 기록도 남기지 않는다.
+    def answer(self, word: WordRecord, correct: bool, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        if word.id != self.shown:
+            return False
+        self.shown = None
+        if correct:
+            quality = 3 if word.id in self.missed else 5
+            self.solved += 1
+        else:
+            quality = 1
+            self.missed.add(word.id)
+            self.word_manager.note_miss(word.id)
+            self._push(word, self.step + self.RELEARN_GAP)
+        self.word_manager.update_word({"id": word.id, **self.review(word, quality, now)})
+        return True
+
+    @classmethod
+    def review(cls, word: WordRecord, quality: int, now: float) -> dict:
+        ease = max(1.3, word.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        if quality < 3:
+            return {
+                "ease": ease,
+                "interval_days": 0,
+                "reps": 0,
+                "due": now + cls.RELEARN_SECONDS,
+            }
+        reps = word.reps + 1
+        if reps == 1:
+            interval = 1.0
+        elif reps == 2:
+            interval = 6.0
+        else:
+            interval = round(word.interval_days * ease, 1)
+        return {
+            "ease": ease,
+            "interval_days": interval,
+            "reps": reps,
+            "due": now + interval * cls.DAY,
+        }
+
+
+# --- 학습 기록 ---
+# 풀이/채점마다 answer_log에 한 줄 남기고, 같은 writer 작업에서 word_stats 집계를 UPSERT로 늘린다.
+# 통계 화면과 가중치는 로그를 다시 훑지 않고 단어당 한 줄인 집계만 읽는다.
+class StudyStats:
+    _instances: dict[str, "StudyStats"] = {}
+    MIN_ATTEMPTS = 3  # 이만큼 풀어 봐야 정답률을 믿는다
+    HARD_ACCURACY = 0.6  # 정답률이 이보다 낮으면 어려운 단어로 친다
+    WEAK_IDS_SQL = (
+        f"SELECT word_id FROM {WORD_STATS_TABLE_NAME} "
+        "WHERE attempts >= ? AND correct < attempts * ?"
+    )
+
+    def __new__(cls, db_name: str = DB_NAME):
+        key = os.path.abspath(db_name)
+        with INSTANCES_LOCK:
+            if key not in cls._instances:
+                cls._instances[key] = super().__new__(cls)
+        return cls._instances[key]
+
+    def __init__(self, db_name: str = DB_NAME) -> None:
+        if hasattr(self, "db"):
+            return
+        self.db = SqliteManager(db_name)
+
+    @classmethod
+    def weak_args(cls) -> tuple:
+        return (cls.MIN_ATTEMPTS, cls.HARD_ACCURACY)
+
+    @staticmethod
+    def _record(
+        conn: sqlite3.Connection,
+        word_id: int,
+        kind: str,
+        correct: int | None,
+        score: int | None,
+        now: float,
+    ):
+        conn.execute(
+            f"""INSERT INTO {ANSWER_LOG_TABLE_NAME} (word_id, kind, correct, score, created)
+            VALUES (?, ?, ?, ?, ?)""",
+            (word_id, kind, correct, score, now),
+        )
+        graded = score is not None
+        conn.execute(
+            f"""INSERT INTO {WORD_STATS_TABLE_NAME} VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(word_id) DO UPDATE SET
+                attempts = attempts + excluded.attempts,
+                correct = correct + excluded.correct,
+                grade_count = grade_count + excluded.grade_count,
+                score_sum = score_sum + excluded.score_sum,
+                last_seen = excluded.last_seen""",
+            (
+                word_id,
+                int(correct is not None),
+                correct or 0,
+                int(graded),
+                score if graded else 0,
+                now,
+            ),
+        )
+
+    # 결과를 기다리지 않는다 (writer가 다음 배치에서 커밋)
+    def record_answer(self, word_id: int, kind: str, correct: bool) -> Future:
+        return self.db.submit(
+            self._record, (word_id, kind, int(correct), None, time.time())
+        )
+
+    def record_grade(self, word_id: int, score: Any) -> Future | None:
+        try:
+            score = int(score)
+        except (TypeError, ValueError):
+            return None
+        return self.db.submit(self._record, (word_id, "writing", None, score, time.time()))
+
+    @classmethod
+    def is_weak(cls, attempts: int, correct: int) -> bool:
+        return attempts >= cls.MIN_ATTEMPTS and correct < attempts * cls.HARD_ACCURACY
+
+    # 단어 캐시를 처음 채울 때 한 번 읽는다: id -> [푼 횟수, 맞힌 횟수]
+    def answer_counts(self) -> dict[int, List[int]]:
+        sql = f"SELECT word_id, attempts, correct FROM {WORD_STATS_TABLE_NAME} WHERE attempts > 0"
+        return {r[0]: [r[1], r[2]] for r in self.db.conn.execute(sql)}
+
+    def summary(self) -> dict:
+        self.db.flush()
+        row = self.db.conn.execute(
+            f"""SELECT COUNT(*), SUM(attempts), SUM(correct), SUM(grade_count),
+            SUM(score_sum), MAX(last_seen) FROM {WORD_STATS_TABLE_NAME}"""
+        ).fetchone()
+        words, attempts, correct, grades, score_sum, last_seen = (
+            v or 0 for v in row
+        )
+        weak = self.db.conn.execute(
+            f"SELECT COUNT(*) FROM ({self.WEAK_IDS_SQL})", self.weak_args()
+        ).fetchone()[0]
+        return {
+            "words": words,
+            "attempts": attempts,
+            "accuracy": correct / attempts if attempts else None,
+            "grades": grades,
+            "average_score": score_sum / grades if grades else None,
+            "last_seen": last_seen or None,
+            "weak_words": weak,
+        }
+
+    # 정답률이 낮은 순. 풀이 기록이 없는 단어(작문만 한 단어)는 뒤로 간다.
+    def weakest(self, limit: int = 100) -> List[dict]:
+        sql = f"""SELECT w.word, w.meaning, s.attempts, s.correct, s.grade_count,
+            s.score_sum, s.last_seen
+            FROM {WORD_STATS_TABLE_NAME} s JOIN {TABLE_NAME} w ON w.id = s.word_id
+            ORDER BY s.attempts = 0, CAST(s.correct AS REAL) / MAX(s.attempts, 1),
+            s.attempts DESC LIMIT ?"""
+        return [dict(r) for r in self.db.conn.execute(sql, (limit,))]
+
+
+# --- Gemini 클라이언트 ---
+# 앱 전체에서 클라이언트 하나를 공유해 HTTP 연결 풀을 재사용한다.
+# 시작 직후 백그라운드에서 한 번 호출해 TLS 연결을 미리 열어 둔다.
+class GeminiService:
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "lock"):
+            return
+        self.lock = threading.Lock()
+        self.client: Any = None
+        self.api_key: str | None = None
+        self.model_id = MODEL_ID
+
+    def load_api_key(self) -> str:
+        key_data = SqliteManager().get_all(table=KEY_TABLE_NAME)
+        return key_data[0]["api_key"] if key_data else ""
+
+    def get_client(self) -> Any:
+        with self.lock:
+            if self.api_key is None:
+                self.api_key = self.load_api_key()
+            if self.client is None:
+                genai, _ = load_genai()
+                self.client = genai.Client(api_key=self.api_key)
+            return self.client
+
+    def set_api_key(self, api_key: str):
+        db = SqliteManager()
+        if db.get_all(table=KEY_TABLE_NAME):
+            db.query(f"UPDATE {KEY_TABLE_NAME} SET api_key=?", (api_key,))
+        else:
+            db.insert(table=KEY_TABLE_NAME, data={"api_key": api_key})
+        with self.lock:
+            # 키가 바뀐 경우에만 클라이언트를 다시 만든다
+            if api_key != self.api_key:
+                self.api_key = api_key
+                self.client = None
+
+    def warm_up(self):
+        threading.Thread(target=self._warm_up, name="gemini-warmup", daemon=True).start()
+
+    def _warm_up(self):
+        try:
+            self.get_client().models.get(model=self.model_id)
+        except Exception as e:
+            print(f"Gemini 예열 실패: {e}")
+
+
+# --- 작문 사전 검사 ---
+# API를 부르기 전에 뻔히 틀린 작문(목표 단어 없음, 너무 짧음, 저장된 예문 복사)을 걸러
+# 같은 original/corrected/score/feedback 형태로 바로 돌려준다. 애매하면 통과시킨다.
+MIN_WRITING_WORDS = 2
+WRITING_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+# 구동사 표기에 쓰는 자리 표시자는 문장에 없어도 된다
+PHRASE_PLACEHOLDERS = frozenset(
+    ["sb", "sth", "someone", "somebody", "something", "one", "one's", "oneself"]
+)
+IRREGULAR_FORMS = {
+    "be": "am is are was were been being",
+    "have": "has had having",
+    "do": "does did done doing",
+    "go": "goes went gone going",
+    "make": "made",
+    "take": "took taken",
+    "come": "came",
+    "see": "saw seen",
+    "get": "got gotten",
+    "give": "gave given",
+    "know": "knew known",
+    "think": "thought",
+    "say": "said",
+    "tell": "told",
+    "find": "found",
+    "run": "ran",
+    "write": "wrote written",
+    "eat": "ate eaten",
+    "buy": "bought",
+    "bring": "brought",
+    "begin": "began begun",
+    "break": "broke broken",
+    "choose": "chose chosen",
+    "drive": "drove driven",
+    "fall": "fell fallen",
+    "feel": "felt",
+    "fly": "flew flown flies",
+    "forget": "forgot forgotten",
+    "grow": "grew grown",
+    "hold": "held",
+    "keep": "kept",
+    "leave": "left",
+    "lose": "lost",
+    "meet": "met",
+    "pay": "paid",
+    "lay": "laid",
+    "lie": "lay lain lied lying",
+    "ride": "rode ridden",
+    "rise": "rose risen",
+    "sell": "sold",
+    "send": "sent",
+    "sit": "sat",
+    "speak": "spoke spoken",
+    "spend": "spent",
+    "stand": "stood",
+    "steal": "stole stolen",
+    "swim": "swam swum",
+    "teach": "taught",
+    "catch": "caught",
+    "seek": "sought",
+    "fight": "fought",
+    "throw": "threw thrown",
+    "understand": "understood",
+    "wear": "wore worn",
+    "win": "won",
+    "bear": "bore borne born",
+    "bite": "bit bitten",
+    "blow": "blew blown",
+    "build": "built",
+    "burn": "burnt",
+    "cost": "cost",
+    "dig": "dug",
+    "draw": "drew drawn",
+    "dream": "dreamt",
+    "drink": "drank drunk",
+    "feed": "fed",
+    "forgive": "forgave forgiven",
+    "freeze": "froze frozen",
+    "hang": "hung",
+    "hear": "heard",
+    "hide": "hid hidden",
+    "hit": "hit",
+    "hurt": "hurt",
+    "lead": "led",
+    "learn": "learnt",
+    "lend": "lent",
+    "light": "lit",
+    "mean": "meant",
+    "ring": "rang rung",
+    "shake": "shook shaken",
+    "shine": "shone",
+    "shoot": "shot",
+    "show": "shown",
+    "shut": "shut",
+    "sing": "sang sung",
+    "sink": "sank sunk",
+    "sleep": "slept",
+    "slide": "slid",
+    "spread": "spread",
+    "spring": "sprang sprung",
+    "stick": "stuck",
+    "sting": "stung",
+    "strike": "struck",
+    "swear": "swore sworn",
+    "sweep": "swept",
+    "swing": "swung",
+    "tear": "tore torn",
+    "wake": "woke woken",
+    "weep": "wept",
+    "wind": "wound",
+    "analysis": "analyses",
+    "basis": "bases",
+    "crisis": "crises",
+    "criterion": "criteria",
+    "phenomenon": "phenomena",
+    "datum": "data",
+    "medium": "media",
+    "thesis": "theses",
+    "life": "lives",
+    "goose": "geese",
+    "child": "children",
+    "man": "men",
+    "woman": "women",
+    "person": "people",
+    "mouse": "mice",
+    "foot": "feet",
+    "tooth": "teeth",
+    "good": "better best",
+    "bad": "worse worst",
+}
+VOWELS = "aeiou"
+
+
+def writing_tokens(text: str) -> List[str]:
+    return WRITING_TOKEN_RE.findall(unicodedata.normalize("NFKC", text).casefold())
+
+
+# 규칙 변화(s/es/ies/ed/ing/er/est/ly, 자음 겹침, e 탈락)와 작은 불규칙 표로 만든 변화형 집합
+@functools.lru_cache(maxsize=1024)
+def inflections(base: str) -> frozenset:
+    forms = {base}
+    for suffix in ("s", "es", "d", "ed", "ing", "er", "est", "ly"):
+        forms.add(base + suffix)
+    if len(base) > 1 and base[-1] == "y" and base[-2] not in VOWELS:
+        forms.update(base[:-1] + s for s in ("ies", "ied", "ier", "iest", "ily"))
+    if base.endswith("ie"):
+        forms.add(base[:-2] + "ying")
+    if base.endswith("e"):
+        forms.update(base[:-1] + s for s in ("ing", "able", "er", "est"))
+    if base.endswith("le"):
+        forms.add(base[:-1] + "y")
+    if base.endswith("c"):
+        forms.update((base + "ked", base + "king"))
+    if base.endswith("f"):
+        forms.add(base[:-1] + "ves")
+    elif base.endswith("fe"):
+        forms.add(base[:-2] + "ves")
+    if (
+        len(base) >= 3
+        and base[-1] not in VOWELS + "wxy"
+        and base[-2] in VOWELS
+        and base[-3] not in VOWELS
+    ):
+        forms.update(base + base[-1] + s for s in ("ed", "ing", "er", "est"))
+    forms.update(IRREGULAR_FORMS.get(base, "").split())
+    return frozenset(forms)
+
+
+# 변화형 표에 없어도 비슷한 긴 단어면 있는 것으로 친다 (표가 모자라 맞는 문장을 떨어뜨리지 않게).
+# 짧은 단어는 철자 한두 개 차이로 전혀 다른 단어가 되므로(love/have, run/sun) 표로만 본다.
+def near_target(token: str, target: str, forms: frozenset) -> bool:
+    if token in forms:
+        return True
+    # 끝 두 글자만 바뀐 긴 단어의 변화형 (criteria, analyses). apple/applied처럼
+    # 다른 단어가 걸리지 않게 적어도 다섯 글자는 같아야 한다.
+    prefix = max(len(target) - 2, 5)
+    if (
+        len(target) >= 5
+        and len(token) >= len(target) - 1
+        and token[:prefix] == target[:prefix]
+    ):
+        return True
+    # 긴 단어의 오타 한 글자 (recieve)
+    return len(target) >= 6 and bounded_edit_distance(token, target, 1) <= 1
+
+
+# 목표 단어(구동사면 각 단어)가 변화형을 포함해 순서대로 나오는지 본다.
+# 사이에 다른 단어가 끼어도 된다 (look the word up).
+def contains_target(word: str, tokens: List[str]) -> bool:
+    targets = [t for t in writing_tokens(word) if t not in PHRASE_PLACEHOLDERS]
+    pos = 0
+    for target in targets:
+        forms = inflections(target)
+        while pos < len(tokens) and not near_target(tokens[pos], target, forms):
+            pos += 1
+        if pos == len(tokens):
+            return False
+        pos += 1
+    return True
+
+
+def precheck_writing(word: str, writing: str, example: str | None = None) -> dict | None:
+    tokens = writing_tokens(writing)
+    feedback = None
+    if len(tokens) < MIN_WRITING_WORDS:
+        feedback = (
+            f"문장이 너무 짧습니다. '{word}'를 넣어 "
+            f"{MIN_WRITING_WORDS}단어 이상의 완전한 문장을 써 보세요."
+        )
+    elif example and tokens == writing_tokens(example):
+        feedback = "저장된 예문을 그대로 옮겼습니다. 자신만의 문장을 새로 만들어 보세요."
+    elif writing_tokens(word) and not contains_target(word, tokens):
+        # 목표 단어가 영어가 아니면(writing_tokens가 비면) 검사하지 않는다
+        feedback = (
+            f"문장에 '{word}'(또는 그 변화형)가 없습니다. 단어를 넣어 다시 써 보세요."
+        )
+    if feedback is None:
+        return None
+    # prechecked: 채점기를 거치지 않은 결과라 점수 통계에는 남기지 않는다
+    return {
+        "original": writing,
+        "corrected": writing,
+        "score": 0,
+        "feedback": feedback,
+        "prechecked": True,
+    }
+
+
+# --- 채점 엔진 ---
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate  # 초당 토큰
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# 같은 단어로 같은 문장을 다시 검사하면 API를 부르지 않고 저장된 채점 결과를 돌려준다.
+# 키는 (단어, 정규화된 작문, 모델, 시스템 지시문)의 해시다.
+class GradeCache:
+    MAX_ENTRIES = 5000
+    MAX_AGE = 30 * 86400
+    EVICT_EVERY = 50  # put 50번마다 정리
+
+    def __init__(self, db: SqliteManager | None = None):
+        self.db = db or SqliteManager()
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+
+    @staticmethod
+    def normalize_writing(writing: str) -> str:
+        return " ".join(unicodedata.normalize("NFKC", writing).split())
+
+    @classmethod
+    def make_key(cls, word: str, writing: str, model_id: str, instruction: str) -> str:
+        raw = json.dumps(
+            [word.strip().casefold(), cls.normalize_writing(writing), model_id, instruction],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        row = self.db.conn.execute(
+            f"SELECT result, created FROM {GRADE_CACHE_TABLE_NAME} WHERE key=?", (key,)
+        ).fetchone()
+        if row is None or now - row["created"] > self.MAX_AGE:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.db.submit(
+            f"UPDATE {GRADE_CACHE_TABLE_NAME} SET last_used=? WHERE key=?", (now, key)
+        )
+        return json.loads(row["result"])
+
+    def put(self, key: str, result: dict):
+        now = time.time()
+        self.db.submit(
+            f"INSERT OR REPLACE INTO {GRADE_CACHE_TABLE_NAME} VALUES (?, ?, ?, ?)",
+            (key, json.dumps(result, ensure_ascii=False), now, now),
+        )
+        self.puts += 1
+        if self.puts % self.EVICT_EVERY == 0:
+            self.evict(now)
+
+    def evict(self, now: float | None = None):
+        now = time.time() if now is None else now
+        self.db.submit(
+            f"DELETE FROM {GRADE_CACHE_TABLE_NAME} WHERE created < ?",
+            (now - self.MAX_AGE,),
+        )
+        self.db.submit(
+            f"""DELETE FROM {GRADE_CACHE_TABLE_NAME} WHERE key IN (
+                SELECT key FROM {GRADE_CACHE_TABLE_NAME}
+                ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.MAX_ENTRIES,),
+        )
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# 고정된 워커 스레드가 큐에서 채점 요청을 꺼내 처리한다.
+# 분당 요청 수는 토큰 버킷으로 제한하고, 429/5xx는 지터를 섞은 지수 백오프로 재시도한다.
+class GradingEngine:
+    _instance = None
+    WORKERS = 2
+    MAX_PENDING = 16
+    RATE_PER_MINUTE = 10
+    BURST = 3
+    MAX_RETRIES = 5
+    # BATCH_SIZE가 2 이상이면 BATCH_WINDOW 동안 모인 작문을 한 요청으로 묶어 보낸다
+    BATCH_SIZE = 1
+    BATCH_WINDOW = 0.3
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "jobs"):
+            return
+        self.client: Any = None  # None이면 공유 GeminiService 클라이언트를 쓴다
+        self.model_id = MODEL_ID
+        self.jobs: queue.Queue = queue.Queue()
+        self.limiter = TokenBucket(self.RATE_PER_MINUTE / 60, self.BURST)
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.cache = GradeCache()
+        for i in range(self.WORKERS):
+            threading.Thread(
+                target=self._work_loop, name=f"grader-{i}", daemon=True
+            ).start()
+
+    def set_client(self, client: Any, model_id: str = MODEL_ID):
+        self.client = client
+        self.model_id = model_id
+
+    # 대기 중인 요청이 MAX_PENDING을 넘으면 None을 돌려줘 호출 측이 거절하게 한다
+    # on_partial을 주면 스트리밍으로 받아 지금까지 도착한 응답 텍스트를 워커 스레드에서 넘겨준다
+    # example은 사전 검사에서 저장된 예문을 베꼈는지 볼 때 쓴다
+    def submit(
+        self,
+        word: str,
+        writing: str,
+        on_partial: Callable[[str], None] | None = None,
+        example: str | None = None,
+    ) -> Future | None:
+        rejected = precheck_writing(word, writing, example)
+        if rejected is not None:
+            done: Future = Future()
+            done.set_result(rejected)
+            return done
+        key = GradeCache.make_key(word, writing, self.model_id, GRADING_INSTRUCTION)
+        cached = self.cache.get(key)
+        if cached is not None:
+            done = Future()
+            done.set_result(cached)
+            return done
+        with self.lock:
+            if self.pending >= self.MAX_PENDING:
+                return None
+            self.pending += 1
+        future: Future = Future()
+        future.add_done_callback(self._on_done)
+        self.jobs.put((word, writing, key, on_partial, future))
+        return future
+
+    def _on_done(self, future: Future):
+        with self.lock:
+            self.pending -= 1
+
+    def _work_loop(self):
+        while True:
+            batch = [self.jobs.get()]
+            deadline = time.monotonic() + self.BATCH_WINDOW
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.jobs.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            pairs = [(word, writing) for word, writing, *_ in batch]
+            word, writing, _, on_partial, _ = batch[0]
+            try:
+                if len(batch) == 1 and on_partial is not None:
+                    results = self.call_with_retry(
+                        lambda: [self.stream_gemini(word, writing, on_partial)]
+                    )
+                else:
+                    results = self.call_with_retry(lambda: self.run_gemini(pairs))
+            except Exception as e:
+                for *_, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, _, key, _, future), result in zip(batch, results):
+                if result is None:
+                    future.set_exception(ValueError("채점 결과가 비어 있습니다."))
+                else:
+                    self.cache.put(key, result)
+                    future.set_result(result)
+
+    def call_with_retry(self, fn: Callable[[], Any]):
+        for attempt in range(self.MAX_RETRIES):
+            self.limiter.acquire()
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.MAX_RETRIES - 1 or not self.is_retryable(e):
+                    raise
+                time.sleep(random.uniform(0, min(30.0, 2.0**attempt)))
+
+    @staticmethod
+    def is_retryable(e: Exception) -> bool:
+        code = getattr(e, "code", None)
+        return code in (429, 500, 503) or "RESOURCE_EXHAUSTED" in str(e)
+
+    @staticmethod
+    def grade_schema() -> Any:
+        _, types = load_genai()
+        return types.Schema(
+            type=types.Type.OBJECT,
+            required=["original", "corrected", "score", "feedback"],
+            properties={
+                "original": types.Schema(type=types.Type.STRING),
+                "corrected": types.Schema(type=types.Type.STRING),
+                "score": types.Schema(type=types.Type.INTEGER),
+                "feedback": types.Schema(type=types.Type.STRING),
+            },
+        )
+
+    def grade_config(self) -> Any:
+        _, types = load_genai()
+        return types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=self.grade_schema(),
+            system_instruction=GRADING_INSTRUCTION,
+        )
+
+    @PERF.timed("gemini.grade_stream")
+    def stream_gemini(
+        self, word: str, writing: str, on_partial: Callable[[str], None]
+    ) -> dict:
+        client = self.client or GeminiService().get_client()
+        text = ""
+        for chunk in client.models.generate_content_stream(
+            model=self.model_id,
+            contents=f"Target word: {word}\nUser writing: {writing}",
+            config=self.grade_config(),
+        ):
+            if chunk.text:
+                text += chunk.text
+                on_partial(text)
+        return json.loads(text)
+
+    @PERF.timed("gemini.grade")
+    def run_gemini(self, pairs: List[Tuple[str, str]]) -> List[dict | None]:
+        client = self.client or GeminiService().get_client()
+        if len(pairs) == 1:
+            word, writing = pairs[0]
+            prompt = f"Target word: {word}\nUser writing: {writing}"
+            response = client.models.generate_content(
+                model=self.model_id, contents=prompt, config=self.grade_config()
+            )
+            return [response.parsed]
+
+        _, types = load_genai()
+        item_schema = self.grade_schema()
+        item_schema.properties["index"] = types.Schema(type=types.Type.INTEGER)
+        item_schema.required.append("index")
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=types.Schema(type=types.Type.ARRAY, items=item_schema),
+            system_instruction=GRADING_INSTRUCTION,
+        )
+        items = [
+            {"index": i, "target_word": word, "user_writing": writing}
+            for i, (word, writing) in enumerate(pairs)
+        ]
+        prompt = (
+            "Evaluate every item independently and return one result per index.\n"
+            + json.dumps(items, ensure_ascii=False)
+        )
+        response = client.models.generate_content(
+            model=self.model_id, contents=prompt, config=config
+        )
+        results: List[dict | None] = [None] * len(pairs)
+        for item in response.parsed or []:
+            idx = item.pop("index", None)
+            if isinstance(idx, int) and 0 <= idx < len(pairs):
+                results[idx] = item
+        return results
+
+
+# --- AI 예문 채우기 ---
+# 예문이나 뜻이 빈 단어를 BATCH개씩 묶어 구조화 출력으로 한 번에 요청한다.
+# 처리한 단어는 결과와 같은 트랜잭션에서 enrich_checkpoint에 기록하므로,
+# 중간에 끊겨도 다음 실행은 남은 단어부터 이어 하고 같은 단어로 두 번 과금되지 않는다.
+class EnrichmentJob:
+    BATCH = 20
+    WORKERS = 2
+    INSTRUCTION = (
+        "You are an English-Korean vocabulary assistant. For every item, return its id, "
+        "a short Korean meaning (comma-separated if several) and one natural English "
+        "example sentence that uses the word. Keep given non-empty values unchanged."
+    )
+
+    def __init__(
+        self,
+        on_progress: Callable[[int, int], None] | None = None,
+        db_name: str = DB_NAME,
+    ):
+        self.db = SqliteManager(db_name)
+        self.engine = GradingEngine()
+        self.on_progress = on_progress
+        self.stop_event = threading.Event()
+        self.done = 0
+        self.failed = 0
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _pending_sql(self, columns: str) -> str:
+        return f"""SELECT {columns} FROM {TABLE_NAME} w
+            WHERE (IFNULL(w.example, '') = '' OR IFNULL(w.meaning, '') = '')
+            AND NOT EXISTS (SELECT 1 FROM {ENRICH_TABLE_NAME} c WHERE c.word_id = w.id)"""
+
+    def count_pending(self) -> int:
+        self.db.flush()
+        return self.db.conn.execute(self._pending_sql("COUNT(*)")).fetchone()[0]
+
+    def iter_batches(self) -> Iterator[List[dict]]:
+        last_id = 0
+        sql = self._pending_sql("w.id, w.word, w.meaning, w.example")
+        sql += " AND w.id > ? ORDER BY w.id LIMIT ?"
+        while not self.stop_event.is_set():
+            rows = [dict(r) for r in self.db.conn.execute(sql, (last_id, self.BATCH))]
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            yield rows
+
+    def run(self) -> Tuple[int, int]:
+        total = self.count_pending()
+        in_flight: set = set()
+        with ThreadPoolExecutor(self.WORKERS, thread_name_prefix="enrich") as pool:
+            for batch in self.iter_batches():
+                # 동시에 WORKERS*2 묶음까지만 띄운다
+                while len(in_flight) >= self.WORKERS * 2:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._collect(finished, total)
+                in_flight.add(pool.submit(self.enrich_batch, batch))
+            self._collect(in_flight, total)
+        return self.done, self.failed
+
+    def _collect(self, futures: Any, total: int):
+        for future in futures:
+            filled, missing = future.result()
+            self.done += filled
+            self.failed += missing
+        if self.on_progress:
+            self.on_progress(self.done, total)
+
+    # (채운 단어 수, 결과가 없어 다음 실행에서 다시 할 단어 수)
+    def enrich_batch(self, batch: List[dict]) -> Tuple[int, int]:
+        if self.stop_event.is_set():
+            return 0, 0
+        try:
+            results = self.engine.call_with_retry(lambda: self.run_gemini(batch))
+            return self.db.call(self._save_batch, batch, results)
+        except Exception as e:
+            print(f"예문 채우기 실패: {e}")
+            return 0, len(batch)
+
+    @PERF.timed("gemini.enrich")
+    def run_gemini(self, batch: List[dict]) -> dict[int, dict]:
+        _, types = load_genai()
+        client = self.engine.client or GeminiService().get_client()
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=types.Schema(
+                type=types.Type.ARRAY,
+                items=types.Schema(
+                    type=types.Type.OBJECT,
+                    required=["id", "meaning", "example"],
+                    properties={
+                        "id": types.Schema(type=types.Type.INTEGER),
+                        "meaning": types.Schema(type=types.Type.STRING),
+                        "example": types.Schema(type=types.Type.STRING),
+                    },
+                ),
+            ),
+            system_instruction=self.INSTRUCTION,
+        )
+        items = [
+            {
+                "id": w["id"],
+                "word": w["word"],
+                "meaning": w["meaning"] or "",
+                "example": w["example"] or "",
+            }
+            for w in batch
+        ]
+        response = client.models.generate_content(
+            model=self.engine.model_id,
+            contents=json.dumps(items, ensure_ascii=False),
+            config=config,
+        )
+        return {r.get("id"): r for r in response.parsed or [] if isinstance(r, dict)}
+
+    @staticmethod
+    def _save_batch(
+        conn: sqlite3.Connection, batch: List[dict], results: dict
+    ) -> Tuple[int, int]:
+        now = time.time()
+        filled = 0
+        for w in batch:
+            r = results.get(w["id"]) or {}
+            meaning = str(r.get("meaning") or "").strip()
+            example = str(r.get("example") or "").strip()
+            # 응답에 빠진 단어는 체크포인트를 남기지 않아 다음 실행에서 다시 요청한다
+            if meaning or example:
+                # 비어 있던 칸만 채운다
+                conn.execute(
+                    f"""UPDATE {TABLE_NAME} SET
+                    meaning = CASE WHEN IFNULL(meaning, '') = '' THEN ? ELSE meaning END,
+                    example = CASE WHEN IFNULL(example, '') = '' THEN ? ELSE example END
+                    WHERE id = ?""",
+                    (meaning, example, w["id"]),
+                )
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {ENRICH_TABLE_NAME} VALUES (?, ?, ?)",
+                    (w["id"], "done", now),
+                )
+                filled += 1
+        return filled, len(batch) - filled
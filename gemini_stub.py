@@ -0,0 +1,61 @@
+# Gemini 클라이언트 대역. 벤치마크와 부하 테스트에서 API를 부르지 않고 채점 흐름을 돌린다.
+#   engine = GradingEngine(); engine.set_client(StubGeminiClient(latency=0.5))
+# generate_content만 흉내 내며, latency 초만큼 기다린 뒤 고정된 형태의 결과를 돌려준다.
+import json
+import threading
+import time
+from typing import Any
+
+
+class StubResponse:
+    def __init__(self, parsed: Any):
+        self.parsed = parsed
+        self.text = json.dumps(parsed, ensure_ascii=False)
+
+
+class StubModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def grade(writing: str) -> dict:
+        return {
+            "original": writing,
+            "corrected": writing,
+            "score": min(100, 40 + len(writing.split()) * 5),
+            "feedback": "좋아요.",
+        }
+
+    def generate_content(self, model: str, contents: str, config: Any = None):
+        with self.lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        # 묶음 채점: 설명 한 줄 뒤에 [{"index", "target_word", "user_writing"}, ...]
+        if contents.startswith("Evaluate every item"):
+            items = json.loads(contents.split("\n", 1)[1])
+            return StubResponse(
+                [{"index": i["index"], **self.grade(i["user_writing"])} for i in items]
+            )
+        # 예문 채우기: [{"id", "word", "meaning", "example"}, ...]
+        if contents.startswith("["):
+            items = json.loads(contents)
+            return StubResponse(
+                [
+                    {
+                        "id": i["id"],
+                        "meaning": i["meaning"] or "뜻",
+                        "example": i["example"] or f"This is an example of {i['word']}.",
+                    }
+                    for i in items
+                ]
+            )
+        writing = contents.rsplit("User writing: ", 1)[-1]
+        return StubResponse(self.grade(writing))
+
+
+class StubGeminiClient:
+    def __init__(self, latency: float = 0.0):
+        self.models = StubModels(latency)
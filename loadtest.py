@@ -0,0 +1,264 @@
+# server.py 부하 테스트. 스텁 Gemini로 서버를 띄우고 가상 학생들이 동시에 학습/퀴즈/작문을 한다.
+#   uv run loadtest.py --users 30 --duration 20 --output loadtest.json
+#   uv run loadtest.py --url http://127.0.0.1:8080   # 이미 떠 있는 서버에 붙기
+# 결과는 요청 종류별 횟수, 오류 수, p50/p95/최대 지연(ms)과 초당 처리량을 JSON으로 남긴다.
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Tuple
+from urllib.parse import urlsplit
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# keep-alive 연결 하나로 요청을 차례로 보내는 최소 HTTP/1.1 클라이언트
+class Client:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def request(self, method: str, path: str, body: Any = None) -> Tuple[int, Any]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.writer.write(
+            (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n"
+            ).encode()
+            + payload
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            key, _, value = line.decode("latin-1").partition(":")
+            if key.lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data) if data else None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list] = {}
+        self.errors: dict[str, int] = {}
+
+    async def call(
+        self, client: Client, label: str, method: str, path: str, body: Any = None
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            status, data = await client.request(method, path, body)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            status, data = 0, None
+            client.writer = None
+        self.samples.setdefault(label, []).append(time.perf_counter() - started)
+        if not 200 <= status < 300:
+            self.errors[label] = self.errors.get(label, 0) + 1
+            return None
+        return data
+
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        total = 0
+        for label, samples in sorted(self.samples.items()):
+            ms = sorted(s * 1000 for s in samples)
+            total += len(ms)
+            routes[label] = {
+                "n": len(ms),
+                "errors": self.errors.get(label, 0),
+                "p50_ms": round(ms[len(ms) // 2], 2),
+                "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 2),
+                "max_ms": round(ms[-1], 2),
+            }
+        return {
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "per_second": round(total / elapsed, 1),
+            "routes": routes,
+        }
+
+
+# 학생 한 명: 단어를 넣고 나서 끝날 때까지 학습, 퀴즈, 검색, 작문, 통계를 섞어 보낸다
+async def student(
+    index: int, host: str, port: int, args: argparse.Namespace, rec: Recorder, stop: float
+):
+    rng = random.Random(args.seed + index)
+    client = Client(host, port)
+    base = f"/users/student{index:03d}"
+    words = []
+    for i in range(args.words):
+        word = f"word{i}"
+        meaning = f"뜻{i}"
+        data = await rec.call(
+            client,
+            "add_word",
+            "POST",
+            f"{base}/words",
+            {"word": word, "meaning": meaning, "example": f"I use {word} often."},
+        )
+        if data:
+            words.append(data)
+    meanings = {w["id"]: w["meaning"] for w in words}
+
+    while time.monotonic() < stop:
+        action = rng.random()
+        if action < 0.45:
+            await rec.call(client, "study_start", "POST", f"{base}/study/start", {})
+            for _ in range(5):
+                data = await rec.call(client, "study_next", "GET", f"{base}/study/next")
+                card = data and data["card"]
+                if not card:
+                    break
+                answer = meanings[card["id"]] if rng.random() < 0.7 else "모름"
+                await rec.call(
+                    client,
+                    "study_answer",
+                    "POST",
+                    f"{base}/study/answer",
+                    {"id": card["id"], "answer": answer},
+                )
+        elif action < 0.65:
+            data = await rec.call(client, "quiz", "GET", f"{base}/quiz")
+            quiz = data and data["quiz"]
+            if quiz:
+                await rec.call(
+                    client,
+                    "quiz_answer",
+                    "POST",
+                    f"{base}/quiz/answer",
+                    {"id": quiz["id"], "field": quiz["field"], "answer": "모름"},
+                )
+        elif action < 0.85:
+            await rec.call(client, "search", "GET", f"{base}/words?q=word1&limit=50")
+        elif action < 0.95:
+            word = rng.choice(words)
+            writing = f"Yesterday I used {word['word']} in a sentence number {rng.random()}."
+            await rec.call(
+                client,
+                "grade",
+                "POST",
+                f"{base}/grade",
+                {"id": word["id"], "writing": writing},
+            )
+        else:
+            await rec.call(client, "stats", "GET", f"{base}/stats")
+        await asyncio.sleep(rng.uniform(0, args.think_time))
+    await client.close()
+
+
+async def run(host: str, port: int, args: argparse.Namespace) -> dict:
+    rec = Recorder()
+    started = time.monotonic()
+    stop = started + args.duration
+    await asyncio.gather(
+        *(student(i, host, port, args, rec, stop) for i in range(args.users))
+    )
+    elapsed = time.monotonic() - started
+    client = Client(host, port)
+    _, health = await client.request("GET", "/health")
+    await client.close()
+    return {**rec.report(elapsed), "elapsed": round(elapsed, 2), "server": health}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_until_up(host: str, port: int, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client = Client(host, port)
+            await client.request("GET", "/health")
+            await client.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Goeha Words 서버 부하 테스트")
+    parser.add_argument("--users", type=int, default=30)
+    parser.add_argument("--words", type=int, default=50, help="학생마다 넣을 단어 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="측정 시간(초)")
+    parser.add_argument("--think-time", type=float, default=0.2, help="요청 사이 최대 대기(초)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--url", help="이미 떠 있는 서버 주소 (없으면 직접 띄운다)")
+    parser.add_argument("--workers", type=int, default=8, help="직접 띄울 서버의 처리 스레드 수")
+    parser.add_argument("--stub-latency", type=float, default=0.3, help="스텁 채점 지연(초)")
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    args = parser.parse_args()
+
+    server = None
+    work_dir = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname or "127.0.0.1", url.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        work_dir = tempfile.TemporaryDirectory(prefix="goeha-load-")
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                os.path.join(REPO_DIR, "server.py"),
+                "--port",
+                str(port),
+                "--workers",
+                str(args.workers),
+                "--stub-latency",
+                str(args.stub_latency),
+                "--rate-per-minute",
+                "100000",
+                "--grading-workers",
+                "8",
+                "--max-pending",
+                "64",
+            ],
+            cwd=work_dir.name,
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(wait_until_up(host, port))
+        print(f"학생 {args.users}명, {args.duration:g}초 측정 중...", file=sys.stderr)
+        report = asyncio.run(run(host, port, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+            work_dir.cleanup()
+
+    report["config"] = {
+        k: getattr(args, k)
+        for k in ("users", "words", "duration", "think_time", "workers", "stub_latency")
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
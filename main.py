@@ -1,98 +1,219 @@
 import time
+
+STARTUP_T0 = time.perf_counter()  # --profile-startup 기준 시각
+
+import sys
+import math
 import customtkinter
-import sqlite3
 import random
 import threading
 import json
+import re
+import heapq
+import glob
 import os  # 경로 확인용 추가
-from typing import Callable, Tuple, TypedDict, List, Any
-from PIL import Image
-
-# Gemini API
-from google import genai
-from google.genai import types
+import argparse
+from tkinter import TclError, filedialog
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Tuple, List, Any
+
+from core import (
+    BULK_FILETYPES,
+    EnrichmentJob,
+    GeminiService,
+    GradingEngine,
+    KEY_TABLE_NAME,
+    PERF,
+    SqliteManager,
+    StudyScheduler,
+    StudyStats,
+    WordManager,
+    WordRecord,
+    export_words,
+    import_words,
+    init_schema,
+    load_genai,
+)
 
 # 변수
-DB_NAME = "goeha_words.db"
-TABLE_NAME = "words_table"
-KEY_TABLE_NAME = "key_table"
 ICON_PATH = "icon.ico"  # 아이콘 파일명
+BACKGROUND_PATH = "background3.jpg"
+CACHE_DIR = ".goeha_cache"  # 미리 줄여 둔 배경 이미지 등
 
 
-class WordDict(TypedDict):
-    id: int | None
-    word: str
-    meaning: str
-    example: str | None
-    hardness: int
+# 시작 단계별 소요 시간 기록. 기록은 항상 하고 --profile-startup일 때만 출력한다.
+class StartupProfiler:
+    def __init__(self) -> None:
+        self.entries: List[Tuple[str, float, float]] = []  # (이름, 소요 ms, 시작 기준 ms)
+        self.last = STARTUP_T0
+        self.lock = threading.Lock()
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        with self.lock:
+            self.entries.append((name, (now - self.last) * 1000, (now - STARTUP_T0) * 1000))
+            self.last = now
+
+    # 메인 흐름과 별개로 백그라운드에서 잰 구간
+    def record(self, name: str, started: float):
+        now = time.perf_counter()
+        with self.lock:
+            self.entries.append((name, (now - started) * 1000, (now - STARTUP_T0) * 1000))
+
+    def report(self) -> dict:
+        with self.lock:
+            entries = list(self.entries)
+        print(f"{'단계':<32}{'소요(ms)':>10}{'누적(ms)':>10}")
+        for name, took, at in entries:
+            print(f"{name:<32}{took:>10.1f}{at:>10.1f}")
+        data = {
+            "python": sys.version.split()[0],
+            "steps": [
+                {"name": n, "ms": round(t, 1), "at_ms": round(a, 1)} for n, t, a in entries
+            ],
+        }
+        print(json.dumps(data, ensure_ascii=False))
+        return data
 
 
-# --- DB 매니저 ---
-class SqliteManager:
+PROFILER = StartupProfiler()
+PROFILER.mark("imports")
+
+
+# --- UI 업데이트 큐 ---
+# Tk 위젯은 메인 스레드에서만 건드린다. 워커 스레드는 post()로 작업을 넣고,
+# 메인 루프가 after()로 큐를 비운다. 같은 key로 여러 번 넣으면 마지막 것만 실행된다.
+class UiDispatcher:
     _instance = None
+    INTERVAL = 30  # ms, 깨어난 뒤 이만큼 모았다가 한 번에 처리한다
+    WAKE_EVENT = "<<UiDrain>>"
 
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, db_name=DB_NAME):
-        if hasattr(self, "initialized"):
+    def __init__(self, root: Any = None) -> None:
+        if hasattr(self, "root"):
             return
-        self.conn = sqlite3.connect(db_name, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
-        self.initialized = True
-
-    def insert(self, table, data: dict):
-        columns = ", ".join(data.keys())
-        placeholders = ", ".join(["?"] * len(data))
-        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        self.root = root
+        self.lock = threading.Lock()
+        self.updates: dict = {}
+        # 한가할 때는 타이머 없이 쉬고, post()가 가상 이벤트로 깨운다.
+        # mainloop 전에 들어온 것은 처음 한 번 잡아 둔 drain이 처리한다.
+        self.scheduled = True
+        self.root.bind(self.WAKE_EVENT, self._on_wake, add=True)
+        self.root.after(self.INTERVAL, self._drain)
+
+    def post(self, key: Any, fn: Callable[[], None]):
+        with self.lock:
+            self.updates[key] = fn
+            if self.scheduled:
+                return
+            self.scheduled = True
         try:
-            self.cursor.execute(sql, tuple(data.values()))
-            self.conn.commit()
-            return self.cursor.lastrowid
-        except Exception as e:
-            self.conn.rollback()
-
-    def get_all(self, table, where: dict | None = None):
-        sql = f"SELECT * FROM {table}"
-        values = ()
-        if where:
-            conditions = [f"{k}=?" for k in where.keys()]
-            sql += " WHERE " + " AND ".join(conditions)
-            values = tuple(where.values())
-        self.cursor.execute(sql, values)
-        return [dict(row) for row in self.cursor.fetchall()]
-
-    def query(self, sql, args=()):
-        self.cursor.execute(sql, args)
-        if sql.strip().upper().startswith("SELECT"):
-            return [dict(row) for row in self.cursor.fetchall()]
-        else:
-            self.conn.commit()
-            return self.cursor.lastrowid
+            self.root.event_generate(self.WAKE_EVENT, when="tail")
+        except (TclError, RuntimeError):
+            # 창이 닫혔거나 아직 mainloop 전이다. 다음 post에서 다시 깨운다.
+            with self.lock:
+                self.scheduled = False
+
+    def call(self, fn: Callable[[], None]):
+        self.post(object(), fn)
+
+    def _on_wake(self, event=None):
+        self.root.after(self.INTERVAL, self._drain)
+
+    def _drain(self):
+        with self.lock:
+            updates, self.updates = self.updates, {}
+            self.scheduled = False
+        for fn in updates.values():
+            try:
+                fn()
+            except Exception as e:
+                print(f"UI 업데이트 실패: {e}")
+
+
+GRADE_LABELS = (
+    ("original", "원문"),
+    ("corrected", "교정"),
+    ("score", "점수"),
+    ("feedback", "피드백"),
+)
+PARTIAL_FIELD_RE = re.compile(
+    r'"(original|corrected|score|feedback)"\s*:\s*(?:"((?:[^"\\]|\\.)*)|(-?\d+))'
+)
+
+
+def format_grade(result: dict) -> str:
+    return "\n".join(
+        f"{label}: {result[k]}" for k, label in GRADE_LABELS if result.get(k) is not None
+    )
+
+
+# 스트리밍 중인 (아직 닫히지 않은) JSON에서 지금까지 온 필드만 뽑아 보여준다
+def format_partial_grade(text: str) -> str:
+    fields: dict = {}
+    for m in PARTIAL_FIELD_RE.finditer(text):
+        raw = m.group(2)
+        if raw is None:
+            fields[m.group(1)] = m.group(3)
+            continue
+        try:
+            fields[m.group(1)] = json.loads(f'"{raw}"')
+        except ValueError:
+            fields[m.group(1)] = raw.replace('\\"', '"')
+    return format_grade(fields) or "분석 중..."
 
 
-class WordManager:
-    _instance = None
+# --- 작문 모달 ---
+# 작문 카드 위젯 한 벌. 스크롤하면 다른 단어에 다시 바인딩된다.
+class WritingCard:
+    def __init__(self, parent: Any, on_submit: Callable, on_edit: Callable):
+        self.word: WordRecord | None = None
+        self.frame = customtkinter.CTkFrame(parent, fg_color="transparent")
+        self.word_label = customtkinter.CTkLabel(
+            self.frame, text="", font=("Arial", 16, "bold")
+        )
+        self.word_label.pack(pady=(10, 5), padx=20, anchor="w")
 
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+        self.entry = customtkinter.CTkEntry(
+            self.frame,
+            placeholder_text="이 단어를 사용하여 작문하세요.",
+            width=400,
+        )
+        self.entry.pack(pady=5, padx=20)
+        self.entry.bind("<KeyRelease>", lambda e: on_edit(self))
 
-    def __init__(self) -> None:
-        if hasattr(self, "sq_manager"):
-            return
-        self.sq_manager = SqliteManager()
+        self.result_box = customtkinter.CTkTextbox(
+            self.frame, width=400, height=100, activate_scrollbars=False
+        )
+        self.result_box.pack(pady=5, padx=20)
+        self.result_box.configure(state="disabled")
 
-    def get_all_words(self) -> List[Any]:
-        return self.sq_manager.get_all(TABLE_NAME)
+        self.btn_submit = customtkinter.CTkButton(
+            self.frame, text="검사하기", command=lambda: on_submit(self)
+        )
+        self.btn_submit.pack(pady=(5, 20), padx=20)
+
+    def show_text(self, text: str):
+        self.entry.delete(0, "end")
+        if text:
+            self.entry.insert(0, text)
+
+    def show_result(self, text: str):
+        self.result_box.configure(state="normal")
+        self.result_box.delete("0.0", "end")
+        self.result_box.insert("0.0", text)
+        self.result_box.configure(state="disabled")
 
 
-# --- 작문 모달 ---
 class WritingModal(customtkinter.CTkToplevel):
+    CARD_HEIGHT = 250
+
+    @PERF.timed("ui.writing_modal")
     def __init__(self, parent: Any, title: str = "작문시험"):
         super().__init__(parent)
         self.title(title)
@@ -106,99 +227,86 @@ class WritingModal(customtkinter.CTkToplevel):
 
         self.grab_set()
 
-        key_data = SqliteManager().get_all(table=KEY_TABLE_NAME)
-        api_key = key_data[0]["api_key"] if key_data else ""
+        self.engine = GradingEngine()
+        self.ui = UiDispatcher()
+        # 화면 밖 카드의 입력/결과는 위젯 대신 여기에 보관한다 (단어 id 기준)
+        self.drafts: dict[int, str] = {}
+        self.results: dict[int, str] = {}
 
-        self.client = genai.Client(api_key=api_key)
-        self.model_id = "gemini-3-flash-preview"
-
-        self.scroll_frame = customtkinter.CTkScrollableFrame(
-            self, width=450, height=500
+        self.test_list = VirtualList(
+            self,
+            make_row=lambda parent: WritingCard(
+                parent, on_submit=self.start_analysis, on_edit=self.save_draft
+            ),
+            bind_row=self.bind_card,
+            row_height=self.CARD_HEIGHT,
+            wheel_step=1,
+            width=450,
+            height=500,
         )
-        self.scroll_frame.pack(pady=20, padx=20, fill="both", expand=True)
-
-        words = WordManager().get_all_words()
-        for word in words:
-            self.render_word_test(word=word)
+        self.test_list.pack(pady=20, padx=20, fill="both", expand=True)
+        self.test_list.set_items(WordManager().get_all_words())
 
         self.btn_exit = customtkinter.CTkButton(self, text="닫기", command=self.destroy)
         self.btn_exit.pack(pady=10)
 
-    def render_word_test(self, word: WordDict):
-        word_label = customtkinter.CTkLabel(
-            self.scroll_frame, text=f"단어: {word['word']}", font=("Arial", 16, "bold")
-        )
-        word_label.pack(pady=(10, 5), padx=20, anchor="w")
-
-        entry_user_writing = customtkinter.CTkEntry(
-            self.scroll_frame,
-            placeholder_text="이 단어를 사용하여 작문하세요.",
-            width=400,
-        )
-        entry_user_writing.pack(pady=5, padx=20)
+    def bind_card(self, card: WritingCard, word: WordRecord):
+        card.word = word
+        card.word_label.configure(text=f"단어: {word['word']}")
+        card.show_text(self.drafts.get(word.id, ""))
+        card.show_result(self.results.get(word.id, "결과가 여기에 표시됩니다."))
 
-        result_label = customtkinter.CTkTextbox(
-            self.scroll_frame, width=400, height=100, activate_scrollbars=False
-        )
-        result_label.insert("0.0", "결과가 여기에 표시됩니다.")
-        result_label.pack(pady=5, padx=20)
-        result_label.configure(state="disabled")
+    def save_draft(self, card: WritingCard):
+        if card.word is not None:
+            self.drafts[card.word.id] = card.entry.get()
 
-        btn_submit = customtkinter.CTkButton(
-            self.scroll_frame,
-            text="검사하기",
-            command=lambda: self.start_analysis(
-                word["word"], entry_user_writing, result_label
+    def start_analysis(self, card: WritingCard):
+        word = card.word
+        if word is None:
+            return
+        user_text = card.entry.get()
+        if not user_text.strip():
+            return
+        future = self.engine.submit(
+            word["word"],
+            user_text,
+            on_partial=lambda text: self.post_result(
+                word.id, format_partial_grade(text)
             ),
+            example=word["example"],
         )
-        btn_submit.pack(pady=(5, 20), padx=20)
-
-    def start_analysis(self, word, entry, result_widget):
-        user_text = entry.get()
-        if not user_text.strip():
+        if future is None:
+            self.set_result(word.id, "요청이 너무 많습니다. 잠시 후 다시 시도하세요.")
             return
-        result_widget.configure(state="normal")
-        result_widget.delete("0.0", "end")
-        result_widget.insert("0.0", "분석 중...")
-        result_widget.configure(state="disabled")
-        threading.Thread(
-            target=self.run_gemini, args=(word, user_text, result_widget), daemon=True
-        ).start()
-
-    def run_gemini(self, word, writing, result_widget):
+        self.set_result(word.id, "분석 중...")
+        future.add_done_callback(lambda f: self.on_grade_done(f, word.id))
+
+    # 워커 스레드에서 불린다
+    def on_grade_done(self, future: Future, word_id: int):
         try:
-            config = types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=types.Schema(
-                    type=types.Type.OBJECT,
-                    required=["original", "corrected", "score", "feedback"],
-                    properties={
-                        "original": types.Schema(type=types.Type.STRING),
-                        "corrected": types.Schema(type=types.Type.STRING),
-                        "score": types.Schema(type=types.Type.INTEGER),
-                        "feedback": types.Schema(type=types.Type.STRING),
-                    },
-                ),
-                system_instruction="You are a precise writing evaluator. Use Korean for feedback.",
-            )
-            prompt = f"Target word: {word}\nUser writing: {writing}"
-            response = self.client.models.generate_content(
-                model=self.model_id, contents=prompt, config=config
-            )
-            output_text = f"{response.parsed}"
-            self.update_result_ui(result_widget, output_text)
+            result = future.result()
+            if not result.get("prechecked"):
+                StudyStats().record_grade(word_id, result.get("score"))
+            output_text = format_grade(result)
         except Exception as e:
-            self.update_result_ui(result_widget, f"오류 발생: {str(e)}")
+            output_text = f"오류 발생: {str(e)}"
+        self.post_result(word_id, output_text)
+
+    def post_result(self, word_id: int, text: str):
+        self.ui.post((self, word_id), lambda: self.set_result(word_id, text))
 
-    def update_result_ui(self, widget, text):
-        widget.configure(state="normal")
-        widget.delete("0.0", "end")
-        widget.insert("0.0", text)
-        widget.configure(state="disabled")
+    def set_result(self, word_id: int, text: str):
+        if not self.winfo_exists():
+            return
+        self.results[word_id] = text
+        card = self.test_list.row_for(word_id)
+        if card is not None:
+            card.show_result(text)
 
 
 # --- 단어 추가/수정 모달 ---
 class WordModal(customtkinter.CTkToplevel):
+    @PERF.timed("ui.word_modal")
     def __init__(
         self,
         parent: Any,
@@ -250,12 +358,401 @@ class WordModal(customtkinter.CTkToplevel):
         self.destroy()
 
 
+# --- 통계 모달 ---
+class StatsModal(customtkinter.CTkToplevel):
+    @PERF.timed("ui.stats_modal")
+    def __init__(self, parent: Any, title: str = "학습 통계"):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("520x520")
+
+        # 아이콘 적용
+        try:
+            self.after(200, lambda: self.iconbitmap(ICON_PATH))
+        except:
+            pass
+
+        stats = StudyStats()
+        summary = stats.summary()
+        accuracy = summary["accuracy"]
+        average = summary["average_score"]
+        last_seen = summary["last_seen"]
+        if last_seen:
+            last_seen = time.strftime("%Y-%m-%d %H:%M", time.localtime(last_seen))
+        lines = [
+            f"푼 문제: {summary['attempts']:,}회 (단어 {summary['words']:,}개)",
+            "정답률: " + (f"{accuracy:.0%}" if accuracy is not None else "-"),
+            f"작문 채점: {summary['grades']:,}회, 평균 "
+            + (f"{average:.1f}점" if average is not None else "-"),
+            f"정답률이 낮은 단어: {summary['weak_words']:,}개",
+            f"마지막 학습: {last_seen or '-'}",
+        ]
+        customtkinter.CTkLabel(
+            self, text="\n".join(lines), justify="left", font=("Arial", 14)
+        ).pack(pady=15, padx=20, anchor="w")
+
+        table = customtkinter.CTkTextbox(self, font=("Consolas", 12), wrap="none")
+        table.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        rows = [f"{'단어':<18}{'정답':>9}{'정답률':>7}{'작문 평균':>9}"]
+        for r in stats.weakest():
+            rate = f"{r['correct'] / r['attempts']:.0%}" if r["attempts"] else "-"
+            score = f"{r['score_sum'] / r['grade_count']:.1f}" if r["grade_count"] else "-"
+            solved = f"{r['correct']}/{r['attempts']}"
+            rows.append(f"{r['word'][:18]:<18}{solved:>9}{rate:>7}{score:>9}")
+        table.insert("end", "\n".join(rows))
+        table.configure(state="disabled")
+
+
+# --- 가상화 리스트 ---
+# 화면 높이만큼의 행 위젯만 만들어 두고, 스크롤할 때 데이터만 다시 바인딩한다.
+class VirtualList(customtkinter.CTkFrame):
+    def __init__(
+        self,
+        parent: Any,
+        make_row: Callable[[Any], Any],
+        bind_row: Callable[[Any, Any], None],
+        row_height: int,
+        key: Callable[[Any], Any] = lambda item: item["id"],
+        label_text: str | None = None,
+        wheel_step: int = 2,
+        **kwargs,
+    ):
+        super().__init__(parent, **kwargs)
+        self.pack_propagate(False)
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.key = key
+        self.wheel_step = wheel_step
+        self.items: list = []
+        self.positions: dict = {}
+        self.first = 0
+        self.visible = 1
+        self.rows: List[Any] = []
+        self.bound: List[Any] = []
+        self.shared = False  # items/positions를 빌려 쓰는 중이면 고치기 전에 복사한다
+
+        if label_text:
+            customtkinter.CTkLabel(self, text=label_text).pack(side="top", fill="x")
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", self._on_resize)
+
+        # 휠은 이 목록 안의 위젯에만 붙는 전용 bindtag로 받는다 (bind_all은 앱 전체에 남는다)
+        self.wheel_tag = f"{self}_wheel"
+        if sys.platform.startswith("linux"):
+            self.wheel_events = ("<Button-4>", "<Button-5>")
+        else:
+            self.wheel_events = ("<MouseWheel>",)
+        for sequence in self.wheel_events:
+            self.bind_class(self.wheel_tag, sequence, self._on_mouse_wheel)
+        self._tag_wheel(self)
+
+    def destroy(self):
+        for sequence in self.wheel_events:
+            self.unbind_class(self.wheel_tag, sequence)
+        super().destroy()
+
+    def _tag_wheel(self, widget):
+        widget.bindtags((self.wheel_tag,) + widget.bindtags())
+        for child in widget.winfo_children():
+            self._tag_wheel(child)
+
+    # positions를 같이 넘기면 items와 함께 복사 없이 빌려 쓰고, 처음 고칠 때 복사한다
+    # (전체 단어 스냅샷처럼 다른 곳과 공유하는 읽기 전용 목록).
+    def set_items(self, items: list, positions: dict | None = None):
+        if positions is None:
+            self.items = list(items)
+            self.positions = {self.key(item): i for i, item in enumerate(self.items)}
+        else:
+            self.items, self.positions = items, positions
+        self.shared = positions is not None
+        self.first = min(self.first, self._max_first())
+        self.render(force=True)
+
+    def _own(self):
+        if self.shared:
+            self.items, self.positions = list(self.items), dict(self.positions)
+            self.shared = False
+
+    # 행 단위 패치: 바뀐 행이 화면에 보일 때만 그 행 하나를 다시 바인딩한다.
+    def insert_item(self, item, index: int | None = None):
+        self._own()
+        if index is None or index >= len(self.items):
+            self.positions[self.key(item)] = len(self.items)
+            self.items.append(item)
+        else:
+            self.items.insert(index, item)
+            self._reindex(index)
+        self.render()
+
+    def update_item(self, item):
+        idx = self.positions.get(self.key(item))
+        if idx is None:
+            return
+        if self.items[idx] is not item:
+            self._own()
+            self.items[idx] = item
+        slot = idx - self.first
+        if 0 <= slot < self.visible and slot < len(self.rows):
+            self.bind_row(self.rows[slot], item)
+            self.bound[slot] = item
+
+    # 해당 항목이 지금 화면에 바인딩돼 있으면 그 행 위젯을, 아니면 None을 돌려준다
+    def row_for(self, key: Any) -> Any:
+        idx = self.positions.get(key)
+        if idx is None:
+            return None
+        slot = idx - self.first
+        if 0 <= slot < len(self.rows) and self.bound[slot] is self.items[idx]:
+            return self.rows[slot]
+        return None
+
+    def delete_item(self, item):
+        self._own()
+        idx = self.positions.pop(self.key(item), None)
+        if idx is None:
+            return
+        del self.items[idx]
+        self._reindex(idx)
+        self.first = min(self.first, self._max_first())
+        self.render()
+
+    def _reindex(self, start: int):
+        for i in range(start, len(self.items)):
+            self.positions[self.key(self.items[i])] = i
+
+    def _max_first(self) -> int:
+        return max(0, len(self.items) - self.visible)
+
+    def _on_resize(self, event):
+        row_px = self.row_height * self._get_widget_scaling()
+        self.visible = max(1, math.ceil(event.height / row_px))
+        while len(self.rows) < self.visible:
+            row = self.make_row(self.body)
+            self._tag_wheel(row.frame)
+            self.rows.append(row)
+            self.bound.append(None)
+        self.first = min(self.first, self._max_first())
+        self.render()
+
+    def render(self, force: bool = False):
+        for i, row in enumerate(self.rows):
+            idx = self.first + i
+            if i < self.visible and idx < len(self.items):
+                item = self.items[idx]
+                if force or self.bound[i] is not item:
+                    self.bind_row(row, item)
+                    self.bound[i] = item
+                    row.frame.place(x=0, y=i * self.row_height, relwidth=1)
+            elif self.bound[i] is not None or force:
+                row.frame.place_forget()
+                self.bound[i] = None
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.first / total, min(1, (self.first + self.visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, first: int):
+        first = max(0, min(first, self._max_first()))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    # CTkScrollbar 콜백: ("moveto", f) 또는 ("scroll", n, "units"|"pages")
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.items)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.visible if args[2] == "pages" else 1)
+            self.scroll_to(self.first + step)
+
+    def _on_mouse_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first - self.wheel_step)
+        else:
+            self.scroll_to(self.first + self.wheel_step)
+
+
+class WordRow:
+    def __init__(self, parent: Any):
+        self.frame = customtkinter.CTkFrame(parent, fg_color="transparent")
+        self.star = customtkinter.CTkButton(
+            self.frame, text="⭐", width=30, fg_color="transparent"
+        )
+        self.star.pack(side="left")
+        self.button = customtkinter.CTkButton(
+            self.frame, text="", fg_color="transparent", text_color="black", anchor="w"
+        )
+        self.button.pack(side="left", fill="x", expand=True)
+
+
+# --- 타이머 스케줄러 ---
+class TimerHandle:
+    __slots__ = ("deadline", "callback", "cancelled")
+
+    def __init__(self, deadline: float, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+# 시계/스톱워치/깜짝 알림 타이머를 time.monotonic() 기준 힙 하나로 관리한다.
+# Tk after()는 항상 가장 가까운 마감 하나에만 걸어 둔다.
+class TickScheduler:
+    def __init__(self, root: Any):
+        self.root = root
+        self.heap: list = []
+        self.seq = 0
+        self.after_id: str | None = None
+        self.next_deadline = 0.0
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> TimerHandle:
+        handle = TimerHandle(deadline, callback)
+        self.seq += 1
+        heapq.heappush(self.heap, (deadline, self.seq, handle))
+        self._reschedule()
+        return handle
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        return self.call_at(time.monotonic() + delay, callback)
+
+    def _reschedule(self):
+        while self.heap and self.heap[0][2].cancelled:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return
+        deadline = self.heap[0][0]
+        if self.after_id is not None:
+            if self.next_deadline <= deadline:
+                return
+            self.root.after_cancel(self.after_id)
+        delay_ms = max(0, math.ceil((deadline - time.monotonic()) * 1000))
+        self.after_id = self.root.after(delay_ms, self._run)
+        self.next_deadline = deadline
+
+    def _run(self):
+        self.after_id = None
+        now = time.monotonic()
+        while self.heap and self.heap[0][0] <= now:
+            _, _, handle = heapq.heappop(self.heap)
+            if not handle.cancelled:
+                try:
+                    handle.callback()
+                except Exception as e:
+                    print(f"타이머 콜백 실패: {e}")
+        self._reschedule()
+
+
+# --- 배경 이미지 ---
+# 창 크기(실제 픽셀)에 맞춰 줄인 배경을 만들어 최근 몇 개를 메모리에 두고,
+# 마지막 크기는 디스크에 무압축(PPM)으로 저장해 다음 실행 때 JPEG 디코드를 건너뛴다.
+# get()은 워커 스레드에서 부른다.
+class BackgroundImage:
+    LRU_SIZE = 4  # 메모리에 둘 크기 수
+    DISK_SIZE = 4  # 디스크에 둘 크기 수 (시작 크기는 따로 늘 남긴다)
+
+    def __init__(
+        self,
+        path: str = BACKGROUND_PATH,
+        cache_dir: str = CACHE_DIR,
+        keep: Tuple[int, int] | None = None,
+    ):
+        self.path = path
+        self.cache_dir = cache_dir
+        self.keep = keep  # 다음 실행 첫 화면에 쓰는 크기
+        self.source: Any = None
+        self.source_full = False
+        self.variants: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def thumb_prefix(self) -> str:
+        st = os.stat(self.path)
+        return f"bg_{int(st.st_mtime)}_{st.st_size}_"
+
+    def thumb_path(self, size: Tuple[int, int]) -> str:
+        name = f"{self.thumb_prefix()}{size[0]}x{size[1]}.ppm"
+        return os.path.join(self.cache_dir, name)
+
+    def get(self, size: Tuple[int, int]) -> Any:
+        from PIL import Image
+
+        with self.lock:
+            if size in self.variants:
+                self.variants.move_to_end(size)
+                return self.variants[size]
+            thumb = self.thumb_path(size)
+            if os.path.exists(thumb):
+                image = Image.open(thumb)
+                image.load()
+                # 디스크 LRU 순서는 수정 시각으로 따진다
+                try:
+                    os.utime(thumb)
+                except OSError:
+                    pass
+            else:
+                image = self.load_source(size).resize(size, Image.LANCZOS)
+                self.save_thumb(image, thumb)
+            self.variants[size] = image
+            if len(self.variants) > self.LRU_SIZE:
+                self.variants.popitem(last=False)
+            return image
+
+    # 한 번 읽은 원본은 더 큰 크기가 필요해질 때까지 다시 쓴다
+    def load_source(self, size: Tuple[int, int]) -> Any:
+        from PIL import Image
+
+        source = self.source
+        if source is None or (
+            not self.source_full and (source.width < size[0] or source.height < size[1])
+        ):
+            image = Image.open(self.path)
+            full = image.size
+            # JPEG는 draft로 디코드 단계에서 바로 줄여 읽는다
+            image.draft("RGB", size)
+            self.source_full = image.size == full
+            self.source = image.convert("RGB")
+        return self.source
+
+    # 원본이 바뀐 뒤의 옛 썸네일은 지우고, 지금 원본의 것은 시작 크기와
+    # 최근에 쓴 DISK_SIZE개만 남긴다
+    def save_thumb(self, image: Any, thumb: str):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            image.save(thumb)
+            prefix = os.path.join(self.cache_dir, self.thumb_prefix())
+            keep = {thumb}
+            if self.keep is not None:
+                keep.add(self.thumb_path(self.keep))
+            current = []
+            for old in glob.glob(os.path.join(self.cache_dir, "bg_*.ppm")):
+                if old in keep:
+                    continue
+                if old.startswith(prefix):
+                    current.append(old)
+                else:
+                    os.remove(old)
+            current.sort(key=os.path.getmtime, reverse=True)
+            for old in current[self.DISK_SIZE - 1 :]:
+                os.remove(old)
+        except OSError as e:
+            print(f"배경 캐시 저장 실패: {e}")
+
+
 # --- 메인 앱 ---
 class App(customtkinter.CTk):
-    def __init__(self):
+    def __init__(self, profile_startup: bool = False):
         super().__init__()
         self.title("Goeha Words (Full Edition)")
         self.geometry("900x600")
+        self.profile_startup = profile_startup
+        PROFILER.mark("window")
 
         # 🌟 아이콘 적용 (경로에 파일이 있어야 함)
         try:
@@ -267,50 +764,140 @@ class App(customtkinter.CTk):
         # 데이터 및 설정
         self.db = SqliteManager()
         self._word_manager = WordManager()
-        self.sw_running = False
-        self.sw_counter = 0
+        self.timers = TickScheduler(self)
+        self.sw_started: float | None = None  # 실행 중일 때 monotonic 시작 시각
+        self.sw_elapsed = 0.0  # 멈춘 동안 누적된 시간
+        self.sw_handle: TimerHandle | None = None
+        self.alert_handle: TimerHandle | None = None
         self.focus_guard_on = False
+        self.enrich_job: EnrichmentJob | None = None
+        self.quiz_weighted = True  # 깜짝 퀴즈에서 어려운/최근 틀린 단어를 더 자주 낸다
         self.current_selected_word = None
-        self.word_queue = []
+        self.current_word = None
+        self.scheduler = StudyScheduler(self._word_manager)
+        self.ui = UiDispatcher(self)
+        self.search_job = None
+        self.perf_overlay: customtkinter.CTkLabel | None = None
+        self.perf_handle: TimerHandle | None = None
+        self.perf_was_enabled = PERF.enabled  # 오버레이를 닫을 때 되돌린다
 
-        self.db.query(
-            f"CREATE TABLE IF NOT EXISTS {TABLE_NAME} (id INTEGER PRIMARY KEY AUTOINCREMENT, word TEXT, meaning TEXT, example TEXT, hardness INTEGER DEFAULT 0)"
-        )
-        self.db.query(
-            f"CREATE TABLE IF NOT EXISTS {KEY_TABLE_NAME} (id INTEGER PRIMARY KEY AUTOINCREMENT, api_key TEXT)"
-        )
+        init_schema(self.db)
+        PROFILER.mark("database")
 
-        self.init_ai_system()
         self.setup_ui()
+        PROFILER.mark("ui")
         self.refresh_word_list()
+        self._word_manager.subscribe(self.on_word_changed)
+        self.bind("<F12>", self.toggle_perf_overlay)
+        PROFILER.mark("word list")
+
+        if profile_startup:
+            self.after_idle(self.finish_startup_profile)
+        else:
+            self.init_ai_system()
 
+    # 창을 먼저 띄운 뒤 키가 없으면 입력 창을 띄우고, 그다음 Gemini 연결을 예열한다
     def init_ai_system(self):
         key_data = self.db.get_all(table=KEY_TABLE_NAME)
         if not key_data:
-            # GUI 환경에서는 input() 대신 다이얼로그를 쓰는게 좋지만, 요청하신 흐름 유지
-            print(
-                """
-aistudio api key를 입력하십시오.
-키가 없다면 아래 링크에서 발급 및 확인이 가능합니다:
-https://aistudio.google.com/app/api-keys
-                  """
-            )
-            input_key = input("api_key: ")
-            self.db.insert(table=KEY_TABLE_NAME, data={"api_key": input_key})
+            self.after(300, self.ask_api_key)
+        else:
+            # 창이 뜬 뒤 Gemini 연결을 미리 열어 첫 채점 지연을 없앤다
+            self.after(1000, GeminiService().warm_up)
+
+    def ask_api_key(self):
+        dialog = customtkinter.CTkInputDialog(
+            title="API 키 설정",
+            text=(
+                "aistudio api key를 입력하십시오.\n"
+                "키가 없다면 https://aistudio.google.com/app/api-keys 에서\n"
+                "발급 및 확인이 가능합니다."
+            ),
+        )
+        input_key = dialog.get_input()
+        if input_key:
+            GeminiService().set_api_key(input_key.strip())
+            GeminiService().warm_up()
+
+    def finish_startup_profile(self):
+        PROFILER.mark("first frame")
+
+        def measure():
+            started = time.perf_counter()
+            load_genai()
+            PROFILER.record("google.genai import (deferred)", started)
+            self.bg_thread.join()
+            self.ui.call(lambda: [PROFILER.report(), self.destroy()])
+
+        threading.Thread(target=measure, daemon=True).start()
+
+    # 배경 이미지는 디코드와 축소를 워커 스레드에서 하고, 완성되면 메인 스레드에서 붙인다
+    def request_background(self, size: Tuple[int, int]):
+        if size == self.bg_size:
+            return
+        self.bg_size = size
+        self.bg_thread = threading.Thread(
+            target=self.load_background, args=(size,), daemon=True
+        )
+        self.bg_thread.start()
 
-    def setup_ui(self):
+    def load_background(self, size: Tuple[int, int]):
+        started = time.perf_counter()
         try:
-            bg_data = Image.open("background3.jpg")
-            self.bg_image = customtkinter.CTkImage(bg_data, size=(900, 600))
-            self.bg_label = customtkinter.CTkLabel(self, text="", image=self.bg_image)
-            self.bg_label.place(relx=0, rely=0, relwidth=1, relheight=1)
-        except:
-            pass
+            bg_data = self.background.get(size)
+        except Exception as e:
+            print(f"배경 이미지 로드 실패: {e}")
+            return
+        PROFILER.record("background image (bg)", started)
+        self.ui.post("background", lambda: self.apply_background(bg_data, size))
+
+    def apply_background(self, bg_data: Any, size: Tuple[int, int]):
+        # 그사이 창 크기가 또 바뀌었으면 버린다
+        if size != self.bg_size:
+            return
+        scale = self._get_window_scaling()
+        self.bg_image = customtkinter.CTkImage(
+            bg_data, size=(size[0] / scale, size[1] / scale)
+        )
+        self.bg_label.configure(image=self.bg_image)
+
+    def on_window_configure(self, event):
+        if event.widget is not self:
+            return
+        # 창 크기 조절 중에는 멈출 때까지 기다렸다가 한 번만 만든다
+        if self.bg_job is not None:
+            self.after_cancel(self.bg_job)
+        self.bg_job = self.after(
+            200, lambda: self.request_background((event.width, event.height))
+        )
+
+    def setup_ui(self):
+        self.bg_label = customtkinter.CTkLabel(self, text="")
+        self.bg_label.place(relx=0, rely=0, relwidth=1, relheight=1)
+        scale = self._get_window_scaling()
+        startup_size = (round(900 * scale), round(600 * scale))
+        self.background = BackgroundImage(keep=startup_size)
+        self.bg_size: Tuple[int, int] | None = None
+        self.bg_job = None
+        self.request_background(startup_size)
+        self.bind("<Configure>", self.on_window_configure, add=True)
+
+        self.word_list_frame = VirtualList(
+            self,
+            make_row=WordRow,
+            bind_row=self.bind_word_row,
+            row_height=30,
+            label_text="내 단어장",
+            width=220,
+            height=350,
+        )
+        self.word_list_frame.place(relx=0.02, rely=0.1)
 
-        self.word_list_frame = customtkinter.CTkScrollableFrame(
-            self, width=200, height=350, label_text="내 단어장"
+        self.search_entry = customtkinter.CTkEntry(
+            self, placeholder_text="🔍 단어/뜻/예문 검색", width=220
         )
-        self.word_list_frame.place(relx=0.02, rely=0.05)
+        self.search_entry.place(relx=0.02, rely=0.04)
+        self.search_entry.bind("<KeyRelease>", self.on_search_key)
 
         self.info_label = customtkinter.CTkLabel(
             self, text="단어를 선택하세요", font=("Arial", 14), justify="left"
@@ -329,6 +916,14 @@ https://aistudio.google.com/app/api-keys
             self, text="수정", width=60, command=self.btn_callback_modify_word
         )
         self.btn_mod.place(relx=0.1, rely=0.92)
+        self.btn_import = customtkinter.CTkButton(
+            self, text="가져오기", width=70, command=self.btn_callback_import
+        )
+        self.btn_import.place(relx=0.14, rely=0.85)
+        self.btn_export = customtkinter.CTkButton(
+            self, text="내보내기", width=70, command=self.btn_callback_export
+        )
+        self.btn_export.place(relx=0.18, rely=0.92)
 
         self.clock_label = customtkinter.CTkLabel(
             self, text="00:00:00", font=("Arial", 20, "bold")
@@ -349,6 +944,16 @@ https://aistudio.google.com/app/api-keys
         )
         self.switch_alert.place(relx=0.98, rely=0.35, anchor="ne")
 
+        self.btn_enrich = customtkinter.CTkButton(
+            self, text="AI 예문 채우기", width=100, command=self.toggle_enrichment
+        )
+        self.btn_enrich.place(relx=0.98, rely=0.43, anchor="ne")
+
+        self.btn_stats = customtkinter.CTkButton(
+            self, text="📊 통계", width=100, command=lambda: StatsModal(self)
+        )
+        self.btn_stats.place(relx=0.98, rely=0.51, anchor="ne")
+
         self.study_frame = customtkinter.CTkFrame(
             self, corner_radius=15, width=600, height=500
         )
@@ -385,31 +990,59 @@ https://aistudio.google.com/app/api-keys
             command=lambda: WritingModal(self),
         ).place(relx=0.5, rely=0.96, anchor="center")
 
+    @PERF.timed("ui.refresh_word_list")
     def refresh_word_list(self):
-        for widget in self.word_list_frame.winfo_children():
-            widget.destroy()
-        words = self._word_manager.get_all_words()
-        for w in words:
-            row = customtkinter.CTkFrame(self.word_list_frame, fg_color="transparent")
-            row.pack(fill="x")
-            star_c = "#FFD700" if w["hardness"] == 1 else "gray"
-            customtkinter.CTkButton(
-                row,
-                text="⭐",
-                width=30,
-                fg_color="transparent",
-                text_color=star_c,
-                command=lambda x=w: self.toggle_h(x),
-            ).pack(side="left")
-            btn = customtkinter.CTkButton(
-                row,
-                text=w["word"],
-                fg_color="transparent",
-                text_color="black",
-                anchor="w",
-                command=lambda x=w: self.show_word_detail(x),
+        text = self.search_entry.get()
+        if self._word_manager.search_terms(text):
+            self.word_list_frame.set_items(self._word_manager.search(text))
+        else:
+            # 빈 검색은 전체 스냅샷과 캐시된 위치를 그대로 빌려 쓴다
+            self.word_list_frame.set_items(
+                self._word_manager.get_all_words(),
+                self._word_manager.snapshot_positions(),
             )
-            btn.pack(side="left", fill="x", expand=True)
+
+    def on_search_key(self, event=None):
+        # 타이핑이 잠깐 멈췄을 때만 검색한다
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(60, self.run_search)
+
+    def run_search(self):
+        self.search_job = None
+        self.word_list_frame.scroll_to(0)
+        self.refresh_word_list()
+
+    def bind_word_row(self, row: WordRow, w):
+        star_c = "#FFD700" if w["hardness"] == 1 else "gray"
+        row.star.configure(text_color=star_c, command=lambda x=w: self.toggle_h(x))
+        row.button.configure(
+            text=w["word"], command=lambda x=w: self.show_word_detail(x)
+        )
+
+    def on_word_changed(self, event: str, row: WordRecord):
+        if event == "reloaded":
+            if self.current_selected_word is not None:
+                self.current_selected_word = self._word_manager.get_word(
+                    self.current_selected_word["id"]
+                )
+            self.refresh_word_list()
+            return
+        selected = self.current_selected_word
+        is_selected = selected is not None and selected["id"] == row["id"]
+        if event == "inserted":
+            terms = self._word_manager.search_terms(self.search_entry.get())
+            if not terms or self._word_manager.matches_search(row, terms):
+                self.word_list_frame.insert_item(row)
+        elif event == "updated":
+            self.word_list_frame.update_item(row)
+            if is_selected:
+                self.show_word_detail(row)
+        elif event == "deleted":
+            self.word_list_frame.delete_item(row)
+            if is_selected:
+                self.current_selected_word = None
+                self.info_label.configure(text="단어를 선택하세요")
 
     def show_word_detail(self, word):
         self.current_selected_word = word
@@ -418,27 +1051,148 @@ https://aistudio.google.com/app/api-keys
 
     def toggle_h(self, word):
         new_v = 1 if word["hardness"] == 0 else 0
-        self.db.query(
-            f"UPDATE {TABLE_NAME} SET hardness=? WHERE id=?", (new_v, word["id"])
-        )
-        self.refresh_word_list()
+        self._word_manager.set_hardness(word, new_v)
 
     def delete_word(self):
         if self.current_selected_word:
-            self.db.query(
-                f"DELETE FROM {TABLE_NAME} WHERE id=?",
-                (self.current_selected_word["id"],),
-            )
-            self.refresh_word_list()
+            self._word_manager.delete_word(self.current_selected_word)
 
     def btn_callback_add_word(self):
-        WordModal(
+        WordModal(self, on_confirm=self._word_manager.add_word)
+
+    def btn_callback_import(self):
+        path = filedialog.askopenfilename(
+            title="단어 가져오기", filetypes=BULK_FILETYPES + [("모든 파일", "*.*")]
+        )
+        if path:
+            self.run_bulk(lambda: self.bulk_import(path))
+
+    def btn_callback_export(self):
+        path = filedialog.asksaveasfilename(
+            title="단어 내보내기", defaultextension=".csv", filetypes=BULK_FILETYPES
+        )
+        if path:
+            self.run_bulk(lambda: self.bulk_export(path))
+
+    # 파일 작업은 워커 스레드에서 돌리고 진행 상황은 UI 큐로 info_label에 보여준다
+    def run_bulk(self, job: Callable[[], None]):
+        self.btn_import.configure(state="disabled")
+        self.btn_export.configure(state="disabled")
+
+        def worker():
+            try:
+                job()
+            except Exception as e:
+                self.show_status(f"오류 발생: {e}")
+            self.ui.call(
+                lambda: [
+                    self.btn_import.configure(state="normal"),
+                    self.btn_export.configure(state="normal"),
+                ]
+            )
+
+        threading.Thread(target=worker, name="bulk-transfer", daemon=True).start()
+
+    def show_status(self, text: str):
+        self.ui.post("bulk", lambda: self.info_label.configure(text=text))
+
+    def bulk_import(self, path: str):
+        # 중간에 실패해도 이미 들어간 묶음이 있으니 캐시는 늘 다시 읽는다
+        try:
+            read, added = import_words(
+                path,
+                on_progress=lambda r, a: self.show_status(
+                    f"가져오는 중... {r:,}줄 읽음, {a:,}개 추가"
+                ),
+            )
+        finally:
+            self.ui.call(self._word_manager.reload)
+        self.show_status(
+            f"가져오기 완료: {read:,}줄 중 {added:,}개 추가 ({read - added:,}개 중복/건너뜀)"
+        )
+
+    def bulk_export(self, path: str):
+        written = export_words(
+            path, on_progress=lambda n: self.show_status(f"내보내는 중... {n:,}개")
+        )
+        self.show_status(f"내보내기 완료: {written:,}개 → {os.path.basename(path)}")
+
+    # F12로 여닫는 숨은 성능 오버레이. 열면 그때부터 계측을 켜고, 닫으면 원래대로 돌린다.
+    def toggle_perf_overlay(self, event=None):
+        if self.perf_overlay is not None:
+            if self.perf_handle:
+                self.perf_handle.cancel()
+            self.perf_overlay.destroy()
+            self.perf_overlay = None
+            PERF.enabled = self.perf_was_enabled
+            return
+        self.perf_was_enabled = PERF.enabled
+        PERF.enabled = True
+        self.perf_overlay = customtkinter.CTkLabel(
             self,
-            on_confirm=lambda d: [
-                self.db.insert(TABLE_NAME, d),
-                self.refresh_word_list(),
-            ],
+            text="",
+            font=("Consolas", 12),
+            justify="left",
+            anchor="nw",
+            fg_color="black",
+            text_color="#7CFC00",
+            corner_radius=6,
         )
+        self.perf_overlay.place(relx=0.5, rely=0.02, anchor="n")
+        self.update_perf_overlay()
+
+    def update_perf_overlay(self):
+        if self.perf_overlay is None:
+            return
+        lines = [f"{'작업':<22}{'횟수':>6}{'p50':>10}{'p95':>10}"]
+        for name, (count, p50, p95) in PERF.stats().items():
+            lines.append(f"{name:<22}{count:>6}{p50:>8.1f}ms{p95:>8.1f}ms")
+        words = self._word_manager.cache_stats()
+        lines.append(
+            f"단어 캐시: 적중 {words['hits']:,} / 실패 {words['misses']:,} "
+            f"({words['hit_rate']:.0%}), {words['size']:,}개"
+        )
+        engine = GradingEngine._instance  # 아직 채점을 안 했으면 만들지 않는다
+        if engine is not None:
+            grades = engine.cache.stats()
+            lines.append(
+                f"채점 캐시: 적중 {grades['hits']:,} / 실패 {grades['misses']:,} "
+                f"({grades['hit_rate']:.0%})"
+            )
+        lines.append(f"대기 중인 API 요청: {engine.pending if engine else 0}")
+        self.perf_overlay.configure(text="\n".join(lines))
+        self.perf_overlay.lift()
+        self.perf_handle = self.timers.call_later(1.0, self.update_perf_overlay)
+
+    # 한 번 더 누르면 멈춘다. 다음에 누르면 멈춘 곳부터 이어서 한다.
+    def toggle_enrichment(self):
+        if self.enrich_job is not None:
+            self.enrich_job.stop()
+            self.btn_enrich.configure(text="멈추는 중...", state="disabled")
+            return
+        job = self.enrich_job = EnrichmentJob(
+            on_progress=lambda done, total: self.show_status(
+                f"예문 채우는 중... {done:,}/{total:,}"
+            )
+        )
+        self.btn_enrich.configure(text="멈추기")
+
+        def worker():
+            try:
+                done, failed = job.run()
+                self.show_status(
+                    f"예문 채우기: {done:,}개 채움, 못 채운 단어 {failed:,}개"
+                )
+            except Exception as e:
+                self.show_status(f"오류 발생: {e}")
+            self.ui.call(self.finish_enrichment)
+
+        threading.Thread(target=worker, name="enrich-job", daemon=True).start()
+
+    def finish_enrichment(self):
+        self.enrich_job = None
+        self.btn_enrich.configure(text="AI 예문 채우기", state="normal")
+        self._word_manager.reload()
 
     def btn_callback_modify_word(self):
         if self.current_selected_word:
@@ -450,28 +1204,18 @@ https://aistudio.google.com/app/api-keys
             )
 
     def update_word(self, data):
-        wid = data.pop("id")
-        cols = ", ".join([f"{k}=?" for k in data.keys()])
-        self.db.query(
-            f"UPDATE {TABLE_NAME} SET {cols} WHERE id=?", tuple(data.values()) + (wid,)
-        )
-        self.refresh_word_list()
+        self._word_manager.update_word(data)
 
     def start_study(self, hard_only):
-        words = self._word_manager.get_all_words()
-        self.word_queue = (
-            [w for w in words if w["hardness"] == 1] if hard_only else words.copy()
-        )
-        if not self.word_queue:
+        if not self.scheduler.start(hard_only):
+            self.word_label.configure(text="복습할 단어가 없어요", text_color="gray")
             return
-        random.shuffle(self.word_queue)
-        self.total_q = len(self.word_queue)
-        self.solved_q = 0
+        self.progress.set(0)
         self.show_next()
 
     def show_next(self):
-        if self.word_queue:
-            self.current_word = self.word_queue.pop(0)
+        self.current_word = self.scheduler.next_card()
+        if self.current_word:
             self.word_label.configure(
                 text=self.current_word["word"], text_color="black"
             )
@@ -480,60 +1224,81 @@ https://aistudio.google.com/app/api-keys
             self.word_label.configure(text="🎉 완료!", text_color="green")
 
     def check_answer_logic(self):
-        user_in = self.interact.get().strip()
-        ans_list = [m.strip() for m in self.current_word["meaning"].split(",")]
-        if user_in in ans_list:
-            self.solved_q += 1
-            self.progress.set(self.solved_q / self.total_q)
+        if not self.current_word:
+            return
+        user_in = self.interact.get()
+        correct = self.current_word.answers("meaning").matches(user_in)
+        if self.scheduler.answer(self.current_word, correct):
+            self._word_manager.record_answer(self.current_word.id, "study", correct)
+        if correct:
+            self.progress.set(self.scheduler.solved / self.scheduler.total)
             self.show_next()
         else:
             self.word_label.configure(
                 text=f"틀림! 정답: {self.current_word['meaning']}", text_color="red"
             )
-            self.word_queue.append(self.current_word)
 
+    # 표시되는 값이 바뀌는 시점(다음 초, 다음 0.1초)에만 깨어난다
     def update_clock(self):
         self.clock_label.configure(text=time.strftime("%H:%M:%S"))
-        self.after(1000, self.update_clock)
+        self.timers.call_later(1.0 - time.time() % 1.0 + 0.001, self.update_clock)
 
     def toggle_stopwatch(self):
-        self.sw_running = not self.sw_running
-        if self.sw_running:
+        if self.sw_started is None:
+            self.sw_started = time.monotonic()
             self.update_sw()
+        else:
+            self.sw_elapsed += time.monotonic() - self.sw_started
+            self.sw_started = None
+            if self.sw_handle:
+                self.sw_handle.cancel()
+            self.render_sw(self.sw_elapsed)
 
     def update_sw(self):
-        if self.sw_running:
-            self.sw_counter += 1
-            ts = self.sw_counter // 10
-            self.sw_label.configure(
-                text=f"{ts//60:02d}:{ts%60:02d}.{self.sw_counter%10}"
-            )
-            self.after(100, self.update_sw)
+        if self.sw_started is None:
+            return
+        elapsed = self.sw_elapsed + time.monotonic() - self.sw_started
+        self.render_sw(elapsed)
+        self.sw_handle = self.timers.call_later(
+            0.1 - elapsed % 0.1 + 0.001, self.update_sw
+        )
+
+    def render_sw(self, elapsed: float):
+        tenths = int(elapsed * 10)
+        ts = tenths // 10
+        self.sw_label.configure(text=f"{ts//60:02d}:{ts%60:02d}.{tenths%10}")
 
     def toggle_focus_guard(self):
         self.focus_guard_on = self.switch_alert.get()
+        # 껐다 켜도 타이머가 겹치지 않도록 기존 것을 항상 취소한다
+        if self.alert_handle:
+            self.alert_handle.cancel()
+            self.alert_handle = None
         if self.focus_guard_on:
-            self.after(30000, self.alert_pop)
+            self.alert_handle = self.timers.call_later(30, self.alert_pop)
 
+    @PERF.timed("ui.quiz_popup")
     def alert_pop(self):
         if not self.focus_guard_on:
             return
-        all_words = self._word_manager.get_all_words()
-        if not all_words:
+        self.alert_handle = self.timers.call_later(30, self.alert_pop)
+        quiz_word = self._word_manager.random_word(weighted=self.quiz_weighted)
+        if quiz_word is None:
             return
 
-        quiz_word = random.choice(all_words)
         quiz_type = random.randint(0, 1)
         if quiz_type == 0:
-            question_text, correct_answer = (
+            question_text, answer_field = (
                 f"{quiz_word['word']}-이 단어의 뜻은?",
-                quiz_word["meaning"],
+                "meaning",
             )
         else:
-            question_text, correct_answer = (
+            question_text, answer_field = (
                 f"{quiz_word['meaning']}-이 뜻을 가진 영단어는?",
-                quiz_word["word"],
+                "word",
             )
+        correct_answer = quiz_word[answer_field]
+        answer_index = quiz_word.answers(answer_field)
 
         win = customtkinter.CTkToplevel(self)
         win.attributes("-topmost", True)
@@ -553,16 +1318,21 @@ https://aistudio.google.com/app/api-keys
             win, placeholder_text="답을 입력하세요", width=250
         )
         answer_entry.pack(pady=10)
+        answered = False  # 팝업마다 첫 제출만 기록한다
 
         def check_quiz():
-            user_input = answer_entry.get().strip()
-            answers = [a.strip() for a in correct_answer.split(",")]
-            if user_input in answers:
+            nonlocal answered
+            correct = answer_index.matches(answer_entry.get())
+            if not answered:
+                answered = True
+                self._word_manager.record_answer(quiz_word.id, "quiz", correct)
+            if correct:
                 result_label.configure(
                     text=f"✅ 정답! ({correct_answer})", text_color="green"
                 )
                 win.after(1500, win.destroy)
             else:
+                self._word_manager.note_miss(quiz_word.id)
                 result_label.configure(
                     text=f"❌ 틀림! 정답: {correct_answer}", text_color="red"
                 )
@@ -570,9 +1340,27 @@ https://aistudio.google.com/app/api-keys
         customtkinter.CTkButton(win, text="제출", command=check_quiz).pack(pady=10)
         result_label = customtkinter.CTkLabel(win, text="")
         result_label.pack(pady=10)
-        self.after(30000, self.alert_pop)
 
 
 if __name__ == "__main__":
-    app = App()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="시작 단계별 import/초기화 시간을 출력하고 종료",
+    )
+    parser.add_argument(
+        "--perf", action="store_true", help="구간별 소요 시간 계측 (F12로 보기)"
+    )
+    parser.add_argument(
+        "--perf-db", action="store_true", help="계측 결과를 DB에도 저장"
+    )
+    args = parser.parse_args()
+    if args.perf or args.perf_db:
+        PERF.enabled = True
+    if args.perf_db:
+        PERF.persist = True
+    app = App(profile_startup=args.profile_startup)
     app.mainloop()
+    if PERF.persist:
+        PERF.save()
@@ -0,0 +1,432 @@
+# Goeha Words HTTP 서비스. 한 프로세스에서 여러 사용자가 각자 단어장으로 학습/채점한다.
+#   uv run server.py --port 8080 --data-dir decks
+#   uv run server.py --stub-latency 0.5    # Gemini 대신 스텁으로 채점 (부하 테스트용)
+# 요청은 asyncio로 받고, DB를 만지는 처리는 스레드 풀에서 돌린다.
+# 같은 사용자의 요청은 단어장 잠금으로 차례대로, 다른 사용자끼리는 동시에 처리한다.
+# 채점은 공유 GradingEngine(워커 풀 + 요청 한도)에 넘기고 풀 스레드를 붙잡지 않고 기다린다.
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from core import (
+    GradingEngine,
+    SqliteManager,
+    StudyScheduler,
+    StudyStats,
+    TokenBucket,
+    WordManager,
+    WordRecord,
+    init_schema,
+)
+
+USER_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+MAX_BODY = 1 << 20
+MAX_HEADERS = 100
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body", "params")
+
+    def __init__(self, method: str, target: str, headers: dict, body: bytes):
+        url = urlsplit(target)
+        self.method = method
+        self.path = unquote(url.path)
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self.headers = headers
+        self.body = body
+        self.params: Tuple[str, ...] = ()
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HttpError(400, "JSON 본문을 읽을 수 없습니다.")
+        if not isinstance(data, dict):
+            raise HttpError(400, "JSON 객체가 필요합니다.")
+        return data
+
+
+# --- 사용자별 단어장 ---
+class Deck:
+    def __init__(self, user: str, db_name: str):
+        self.user = user
+        self.lock = threading.Lock()
+        init_schema(SqliteManager(db_name))
+        self.words = WordManager(db_name)
+        self.stats = StudyStats(db_name)
+        self.scheduler = StudyScheduler(self.words)
+        self.quizzes: dict[int, str] = {}  # 낸 퀴즈 중 아직 답하지 않은 것: id -> field
+
+    def word(self, word_id: Any) -> WordRecord:
+        try:
+            word = self.words.get_word(int(word_id))
+        except (TypeError, ValueError):
+            word = None
+        if word is None:
+            raise HttpError(404, "단어가 없습니다.")
+        return word
+
+
+# 단어장은 처음 요청이 올 때 열고 계속 열어 둔다 (writer 스레드와 읽기 연결 재사용)
+class DeckPool:
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.decks: dict[str, Deck] = {}
+        self.lock = threading.Lock()
+        os.makedirs(data_dir, exist_ok=True)
+
+    def get(self, user: str) -> Deck:
+        if not USER_RE.fullmatch(user):
+            raise HttpError(400, "사용자 이름은 영문, 숫자, -, _ 64자 이내입니다.")
+        deck = self.decks.get(user)
+        if deck is None:
+            with self.lock:
+                deck = self.decks.get(user)
+                if deck is None:
+                    db_name = os.path.join(self.data_dir, f"{user}.db")
+                    deck = self.decks[user] = Deck(user, db_name)
+        return deck
+
+    # 사용자별 단어 캐시 적중 수를 합친다
+    def cache_stats(self) -> dict:
+        total = {"hits": 0, "misses": 0, "size": 0}
+        for deck in list(self.decks.values()):
+            stats = deck.words.cache_stats()
+            for key in total:
+                total[key] += stats[key]
+        lookups = total["hits"] + total["misses"]
+        total["hit_rate"] = total["hits"] / lookups if lookups else 0.0
+        return total
+
+
+def word_json(word: WordRecord) -> dict:
+    return word.to_dict()
+
+
+def required_text(data: dict, key: str) -> str:
+    value = data.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise HttpError(400, f"'{key}' 값이 필요합니다.")
+    return value.strip()
+
+
+# --- 핸들러: 스레드 풀에서 단어장 잠금을 잡은 채로 돈다 ---
+def list_words(deck: Deck, req: Request) -> Tuple[int, Any]:
+    try:
+        limit = min(1000, max(1, int(req.query.get("limit", 100))))
+    except ValueError:
+        raise HttpError(400, "limit은 숫자여야 합니다.")
+    words = deck.words.search(req.query.get("q", ""), limit=limit)
+    return 200, {"words": [word_json(w) for w in words[:limit]]}
+
+
+def add_word(deck: Deck, req: Request) -> Tuple[int, Any]:
+    data = req.json()
+    word = deck.words.add_word(
+        {
+            "word": required_text(data, "word"),
+            "meaning": required_text(data, "meaning"),
+            "example": str(data.get("example") or ""),
+            "hardness": 1 if data.get("hardness") else 0,
+        }
+    )
+    if word is None:
+        raise HttpError(500, "단어를 저장하지 못했습니다.")
+    return 201, word_json(word)
+
+
+def delete_word(deck: Deck, req: Request) -> Tuple[int, Any]:
+    deck.words.delete_word(deck.word(req.params[0]))
+    return 200, {"deleted": int(req.params[0])}
+
+
+def start_study(deck: Deck, req: Request) -> Tuple[int, Any]:
+    total = deck.scheduler.start(bool(req.json().get("hard_only")))
+    return 200, {"total": total}
+
+
+def next_card(deck: Deck, req: Request) -> Tuple[int, Any]:
+    word = deck.scheduler.next_card()
+    if word is None:
+        return 200, {"card": None}
+    return 200, {"card": {"id": word.id, "word": word["word"]}}
+
+
+def answer_card(deck: Deck, req: Request) -> Tuple[int, Any]:
+    data = req.json()
+    word = deck.word(data.get("id"))
+    correct = word.answers("meaning").matches(str(data.get("answer", "")))
+    # 카드가 나온 뒤 첫 답만 기록한다 (틀린 뒤 정답을 보고 다시 낸 답은 빼고)
+    if deck.scheduler.answer(word, correct):
+        deck.words.record_answer(word.id, "study", correct)
+    return 200, {
+        "correct": correct,
+        "meaning": word["meaning"],
+        "solved": deck.scheduler.solved,
+        "total": deck.scheduler.total,
+    }
+
+
+def quiz(deck: Deck, req: Request) -> Tuple[int, Any]:
+    word = deck.words.random_word(weighted=True)
+    if word is None:
+        return 200, {"quiz": None}
+    if random.randint(0, 1) == 0:
+        question, field = f"{word['word']}-이 단어의 뜻은?", "meaning"
+    else:
+        question, field = f"{word['meaning']}-이 뜻을 가진 영단어는?", "word"
+    deck.quizzes[word.id] = field
+    return 200, {"quiz": {"id": word.id, "question": question, "field": field}}
+
+
+def answer_quiz(deck: Deck, req: Request) -> Tuple[int, Any]:
+    data = req.json()
+    word = deck.word(data.get("id"))
+    field = data.get("field")
+    if field not in ("word", "meaning"):
+        raise HttpError(400, "field는 word 또는 meaning입니다.")
+    correct = word.answers(field).matches(str(data.get("answer", "")))
+    # 낸 퀴즈마다 첫 제출만 기록한다
+    if deck.quizzes.get(word.id) == field:
+        del deck.quizzes[word.id]
+        deck.words.record_answer(word.id, "quiz", correct)
+    if not correct:
+        deck.words.note_miss(word.id)
+    return 200, {"correct": correct, "answer": word[field]}
+
+
+def stats(deck: Deck, req: Request) -> Tuple[int, Any]:
+    return 200, {"summary": deck.stats.summary(), "weakest": deck.stats.weakest(20)}
+
+
+ROUTES: List[Tuple[str, re.Pattern, Callable[[Deck, Request], Tuple[int, Any]]]] = [
+    ("GET", re.compile(r"/words"), list_words),
+    ("POST", re.compile(r"/words"), add_word),
+    ("DELETE", re.compile(r"/words/(\d+)"), delete_word),
+    ("POST", re.compile(r"/study/start"), start_study),
+    ("GET", re.compile(r"/study/next"), next_card),
+    ("POST", re.compile(r"/study/answer"), answer_card),
+    ("GET", re.compile(r"/quiz"), quiz),
+    ("POST", re.compile(r"/quiz/answer"), answer_quiz),
+    ("GET", re.compile(r"/stats"), stats),
+]
+USER_PATH_RE = re.compile(r"/users/([^/]+)(/.*)")
+
+
+class WordService:
+    def __init__(self, data_dir: str, workers: int):
+        self.decks = DeckPool(data_dir)
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="http")
+        self.engine = GradingEngine()
+        self.started = time.time()
+        self.requests = 0
+
+    async def dispatch(self, req: Request) -> Tuple[int, Any]:
+        self.requests += 1
+        if req.path == "/health":
+            return 200, {
+                "decks": len(self.decks.decks),
+                "pending_grades": self.engine.pending,
+                "word_cache": self.decks.cache_stats(),
+                "grade_cache": self.engine.cache.stats(),
+                "requests": self.requests,
+                "uptime": round(time.time() - self.started, 1),
+            }
+        m = USER_PATH_RE.fullmatch(req.path)
+        if m is None:
+            raise HttpError(404, "경로가 없습니다.")
+        user, rest = m.groups()
+        if rest == "/grade":
+            if req.method != "POST":
+                raise HttpError(405, "POST만 받습니다.")
+            return await self.grade(user, req)
+        allowed = False
+        for method, pattern, handler in ROUTES:
+            pm = pattern.fullmatch(rest)
+            if pm is None:
+                continue
+            allowed = True
+            if method == req.method:
+                req.params = pm.groups()
+                return await self.run(user, handler, req)
+        raise HttpError(405 if allowed else 404, "지원하지 않는 요청입니다.")
+
+    async def run(self, user: str, handler: Callable, req: Request) -> Tuple[int, Any]:
+        def call():
+            deck = self.decks.get(user)
+            with deck.lock:
+                return handler(deck, req)
+
+        return await asyncio.get_running_loop().run_in_executor(self.pool, call)
+
+    # 단어 확인과 제출(사전 검사, 채점 캐시 조회)은 풀에서 하고,
+    # 채점은 엔진 Future를 이벤트 루프에서 기다린다
+    async def grade(self, user: str, req: Request) -> Tuple[int, Any]:
+        data = req.json()
+        writing = required_text(data, "writing")
+
+        def lookup():
+            deck = self.decks.get(user)
+            with deck.lock:
+                word = deck.word(data.get("id"))
+            future = self.engine.submit(word["word"], writing, example=word["example"])
+            return deck, word, future
+
+        loop = asyncio.get_running_loop()
+        deck, word, future = await loop.run_in_executor(self.pool, lookup)
+        if future is None:
+            raise HttpError(429, "채점 요청이 너무 많습니다. 잠시 후 다시 시도하세요.")
+        try:
+            result = await asyncio.wrap_future(future)
+        except Exception as e:
+            raise HttpError(502, f"채점 실패: {e}")
+        if not result.get("prechecked"):
+            deck.stats.record_grade(word.id, result.get("score"))
+        return 200, result
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                req = await self.read_request(reader)
+                if req is None:
+                    break
+                try:
+                    status, body = await self.dispatch(req)
+                except HttpError as e:
+                    status, body = e.status, {"error": e.message}
+                except Exception as e:
+                    status, body = 500, {"error": str(e)}
+                keep_alive = req.headers.get("connection", "").lower() != "close"
+                writer.write(self.encode(status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            writer.write(self.encode(e.status, {"error": e.message}, False))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Request | None:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "요청 줄이 잘못되었습니다.")
+        headers = {}
+        for _ in range(MAX_HEADERS):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        else:
+            raise HttpError(400, "헤더가 너무 많습니다.")
+        length = headers.get("content-length") or "0"
+        if not (length.isascii() and length.isdigit()):
+            raise HttpError(400, "Content-Length가 잘못되었습니다.")
+        length = int(length)
+        if length > MAX_BODY:
+            raise HttpError(413, "본문이 너무 큽니다.")
+        body = await reader.readexactly(length) if length else b""
+        return Request(method.upper(), target, headers, body)
+
+    @staticmethod
+    def encode(status: int, body: Any, keep_alive: bool) -> bytes:
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode() + payload
+
+
+async def serve(args: argparse.Namespace):
+    service = WordService(args.data_dir, args.workers)
+    server = await asyncio.start_server(service.handle, args.host, args.port)
+    port = server.sockets[0].getsockname()[1]
+    print(f"listening on http://{args.host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Goeha Words HTTP 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", default="decks", help="사용자별 단어장 폴더")
+    parser.add_argument("--workers", type=int, default=8, help="요청 처리 스레드 수")
+    parser.add_argument(
+        "--grading-workers", type=int, default=GradingEngine.WORKERS, help="채점 워커 수"
+    )
+    parser.add_argument(
+        "--rate-per-minute",
+        type=float,
+        default=GradingEngine.RATE_PER_MINUTE,
+        help="분당 Gemini 요청 한도",
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=GradingEngine.MAX_PENDING,
+        help="대기 중인 채점 요청 한도",
+    )
+    parser.add_argument(
+        "--stub-latency",
+        type=float,
+        help="Gemini 대신 이 지연(초)의 스텁 클라이언트로 채점",
+    )
+    args = parser.parse_args()
+
+    # API 키와 채점 캐시는 작업 폴더의 기본 DB(데스크톱 앱과 같은 파일)를 함께 쓴다
+    init_schema(SqliteManager())
+    # 엔진은 프로세스에 하나라서 만들기 전에 설정한다
+    GradingEngine.WORKERS = args.grading_workers
+    GradingEngine.MAX_PENDING = args.max_pending
+    engine = GradingEngine()
+    engine.limiter = TokenBucket(args.rate_per_minute / 60, GradingEngine.BURST)
+    if args.stub_latency is not None:
+        from gemini_stub import StubGeminiClient
+
+        engine.set_client(StubGeminiClient(args.stub_latency))
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()